@@ -12,6 +12,12 @@ from ..models.ecosystem import EcosystemState, EcosystemConfig
 class SimulationEngine:
     """Ecosystem Simulation Engine"""
     
+    # Frame waits shorter than this are spun out instead of slept, for sub-millisecond accuracy
+    SPIN_THRESHOLD = 0.001
+    
+    # Name of the simulation thread, so the loop can be told apart from other threads
+    THREAD_NAME = 'EcosystemSimulation'
+    
     def __init__(self, config: EcosystemConfig):
         self.config = config
         self.ecosystem = EcosystemState(config)
@@ -21,6 +27,7 @@ class SimulationEngine:
         self.is_paused = False
         self.simulation_speed = 1.0  # Simulation speed multiplier
         self.target_fps = 30  # Target frame rate
+        self.frames_dropped = 0  # Frames skipped because a step overran its deadline
         
         # Callback functions
         self.update_callback: Optional[Callable] = None
@@ -29,6 +36,11 @@ class SimulationEngine:
         # Thread control
         self.simulation_thread: Optional[threading.Thread] = None
         self.stop_event = threading.Event()
+        # Held for a whole step and while reading data, so readers on other threads
+        # never see the population arrays half-updated
+        self.state_lock = threading.RLock()
+        # Notified on resume and stop, so a paused loop blocks instead of polling
+        self.pause_condition = threading.Condition()
     
     def set_update_callback(self, callback: Callable):
         """Set update callback function"""
@@ -45,31 +57,42 @@ class SimulationEngine:
         
         self.is_running = True
         self.is_paused = False
-        self.stop_event.clear()
+        # Every loop gets its own stop event: a loop stopped from one of its own callbacks
+        # cannot be joined, and must still see its stop after a restart has begun a new loop
+        self.stop_event = threading.Event()
         
         # Start simulation thread
-        self.simulation_thread = threading.Thread(target=self._simulation_loop)
+        self.simulation_thread = threading.Thread(target=self._simulation_loop, args=(self.stop_event,),
+                                                  name=self.THREAD_NAME)
         self.simulation_thread.daemon = True
         self.simulation_thread.start()
     
     def pause(self):
         """Pause simulation"""
-        self.is_paused = True
+        with self.pause_condition:
+            self.is_paused = True
     
     def resume(self):
         """Resume simulation"""
-        self.is_paused = False
+        with self.pause_condition:
+            self.is_paused = False
+            self.pause_condition.notify_all()
     
     def stop(self):
         """Stop simulation"""
         if not self.is_running:
             return
         
-        self.is_running = False
-        self.is_paused = False
-        self.stop_event.set()
+        with self.pause_condition:
+            self.is_running = False
+            self.is_paused = False
+            self.stop_event.set()
+            self.pause_condition.notify_all()
         
-        if self.simulation_thread and self.simulation_thread.is_alive():
+        # A callback running on the simulation thread may stop or reset the engine; that
+        # loop cannot join itself, and exits on its own once the callback returns
+        if (self.simulation_thread and self.simulation_thread.is_alive()
+                and self.simulation_thread is not threading.current_thread()):
             self.simulation_thread.join()
     
     def reset(self, new_config: Optional[EcosystemConfig] = None):
@@ -82,7 +105,9 @@ class SimulationEngine:
         # Reset ecosystem
         if new_config:
             self.config = new_config
-        self.ecosystem = EcosystemState(self.config)
+        ecosystem = EcosystemState(self.config)
+        with self.state_lock:
+            self.ecosystem = ecosystem
         
         # If it was running before, restart
         if was_running:
@@ -99,20 +124,34 @@ class SimulationEngine:
         """Set simulation speed"""
         self.simulation_speed = max(0.1, min(5.0, speed))
     
-    def get_data(self) -> Dict[str, Any]:
-        """Get simulation data"""
+    def get_data(self, include_individuals: bool = True) -> Dict[str, Any]:
+        """Get simulation data
+        
+        Without include_individuals the per-individual models are not built and
+        'ecosystem_state' is None; 'positions' is always there for drawing.
+        """
+        with self.state_lock:
+            ecosystem = self.ecosystem
+            species_data = ecosystem.get_species_data() if include_individuals else None
+            positions = ecosystem.get_species_positions()
+            species_counts = ecosystem.get_species_counts()
+            statistics = {
+                'time_step': ecosystem.time_step,
+                'births': ecosystem.births,
+                'deaths': ecosystem.deaths,
+                'averages': ecosystem.get_species_averages(),
+                'population_history': ecosystem.population_history
+            }
+        
         return {
-            'ecosystem_state': self.ecosystem.get_species_data(),
-            'species_counts': self.ecosystem.get_species_counts(),
-            'statistics': {
-                'time_step': self.ecosystem.time_step,
-                'births': self.ecosystem.births,
-                'deaths': self.ecosystem.deaths,
-                'population_history': self.ecosystem.population_history
-            },
+            'ecosystem_state': species_data,
+            'positions': positions,
+            'species_counts': species_counts,
+            'statistics': statistics,
             'is_running': self.is_running,
             'is_paused': self.is_paused,
-            'simulation_speed': self.simulation_speed
+            'simulation_speed': self.simulation_speed,
+            'frames_dropped': self.frames_dropped
         }
     
     def update_config(self, new_config: EcosystemConfig):
@@ -120,52 +159,77 @@ class SimulationEngine:
         self.config = new_config
         # Note: This doesn't reset the ecosystem, just updates the config
     
-    def _simulation_loop(self):
-        """Simulation main loop"""
-        last_time = time.time()
+    def _simulation_loop(self, stop_event: threading.Event):
+        """Simulation main loop, run until stop_event is set"""
+        # Steps are scheduled against absolute deadlines, so time spent updating
+        # the ecosystem is not added on top of the frame interval
+        deadline = time.perf_counter()
         
-        while self.is_running and not self.stop_event.is_set():
-            if not self.is_paused:
-                current_time = time.time()
-                
-                # Update ecosystem
-                self._update_ecosystem()
-                
-                # Call update callback
-                if self.update_callback:
-                    self.update_callback(self.get_data())
-                
-                # Check extinction
-                extinct_species = self.ecosystem.check_extinction()
-                if extinct_species and self.extinction_callback:
-                    self.extinction_callback(extinct_species)
-                
-                last_time = current_time
+        while not stop_event.is_set():
+            if self.is_paused:
+                with self.pause_condition:
+                    while self.is_paused and not stop_event.is_set():
+                        self.pause_condition.wait()
+                # Start a fresh schedule rather than counting the pause as dropped frames
+                deadline = time.perf_counter()
+                continue
+            
+            # Update ecosystem
+            self._update_ecosystem()
+            
+            # Call update callback
+            if self.update_callback:
+                self.update_callback(self.get_data())
+                if stop_event.is_set():
+                    break  # The callback stopped or reset the engine
+            
+            # Check extinction
+            extinct_species = self.ecosystem.check_extinction()
+            if extinct_species and self.extinction_callback:
+                self.extinction_callback(extinct_species)
+                if stop_event.is_set():
+                    break
             
             # Control frame rate
-            sleep_time = (1.0 / self.target_fps) / self.simulation_speed
-            time.sleep(sleep_time)
+            frame_interval = (1.0 / self.target_fps) / self.simulation_speed
+            deadline += frame_interval
+            remaining = deadline - time.perf_counter()
+            if remaining > 0:
+                self._wait_until(deadline, stop_event)
+            else:
+                # Running behind: drop the missed frames instead of trying to catch up
+                self.frames_dropped += int(-remaining // frame_interval) + 1
+                deadline = time.perf_counter()
+    
+    def _wait_until(self, deadline: float, stop_event: threading.Event):
+        """Sleep until shortly before the deadline, then spin for the remainder"""
+        remaining = deadline - time.perf_counter()
+        if remaining > self.SPIN_THRESHOLD:
+            # Wake up early through the stop event so stop() is not delayed by a long frame
+            stop_event.wait(remaining - self.SPIN_THRESHOLD)
+        while time.perf_counter() < deadline and not stop_event.is_set():
+            pass
     
     def _update_ecosystem(self):
         """Update ecosystem state"""
-        
-        # Get ecosystem state
-        ecosystem_state = self.ecosystem.get_ecosystem_state()
-        
-        # Update all species
-        self.ecosystem.update_species(ecosystem_state)
-        
-        # Handle reproduction
-        self.ecosystem.handle_reproduction()
-        
-        # Clean up dead individuals
-        self.ecosystem.cleanup_dead()
-        
-        # Update statistics
-        self.ecosystem.update_statistics()
-        
-        #ncrement time step
-        self.ecosystem.time_step += 1
+        with self.state_lock:
+            # Get ecosystem state
+            ecosystem_state = self.ecosystem.get_ecosystem_state()
+            
+            # Update all species
+            self.ecosystem.update_species(ecosystem_state)
+            
+            # Handle reproduction
+            self.ecosystem.handle_reproduction(ecosystem_state)
+            
+            # Clean up dead individuals
+            self.ecosystem.cleanup_dead()
+            
+            # Update statistics
+            self.ecosystem.update_statistics()
+            
+            #ncrement time step
+            self.ecosystem.time_step += 1
 
 
 class SimulationController:
@@ -0,0 +1,233 @@
+"""
+Compiled Simulation Kernels
+Numba versions of the per-tick loops over population arrays.
+Numba is optional: without it (or with ECOSYS_JIT=0) the numpy code in species.py is used instead.
+"""
+
+import os
+import math
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in decorator that leaves the function uncompiled"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+JIT_ENABLED = NUMBA_AVAILABLE and os.environ.get('ECOSYS_JIT', '1') != '0'
+
+# Threading layers tried for the parallel kernels, in order. TBB comes last: once it has run a
+# parallel kernel outside the main thread, which is where SimulationEngine steps the simulation,
+# the process hangs at exit. NUMBA_THREADING_LAYER or NUMBA_THREADING_LAYER_PRIORITY in the
+# environment take precedence.
+THREADING_LAYER_PRIORITY = ['omp', 'workqueue', 'tbb']
+
+# Whether the threading layer preference has been applied
+_threading_layer_chosen = False
+
+
+def _choose_threading_layer():
+    """Apply THREADING_LAYER_PRIORITY before the first parallel kernel runs.
+
+    Numba picks its threading layer once per process, at the first parallel launch, so the
+    preference is only set then rather than on import, and only if the environment has not
+    chosen a layer itself.
+    """
+    global _threading_layer_chosen
+    _threading_layer_chosen = True
+    if NUMBA_AVAILABLE and not ({'NUMBA_THREADING_LAYER', 'NUMBA_THREADING_LAYER_PRIORITY'} & os.environ.keys()):
+        from numba import config as numba_config
+        numba_config.THREADING_LAYER_PRIORITY = THREADING_LAYER_PRIORITY
+
+
+@njit(cache=True)
+def _cell_bounds(px, py, radius, columns, rows, cell_size):
+    """First and last grid column and row overlapping a circle"""
+    x0 = min(max(int((px - radius) // cell_size), 0), columns - 1)
+    x1 = min(max(int((px + radius) // cell_size), 0), columns - 1)
+    y0 = min(max(int((py - radius) // cell_size), 0), rows - 1)
+    y1 = min(max(int((py + radius) // cell_size), 0), rows - 1)
+    return x0, x1, y0, y1
+
+
+@njit(cache=True)
+def _grid_candidates(px, py, radius, cell_start, cell_idx, columns, rows, cell_size):
+    """Rows in the grid cells overlapping a circle, in ascending order (see SpatialGrid.query_radius)"""
+    x0, x1, y0, y1 = _cell_bounds(px, py, radius, columns, rows, cell_size)
+    count = 0
+    for row in range(y0, y1 + 1):
+        count += cell_start[row * columns + x1 + 1] - cell_start[row * columns + x0]
+    candidates = np.empty(count, dtype=np.int64)
+    k = 0
+    for row in range(y0, y1 + 1):
+        for c in range(cell_start[row * columns + x0], cell_start[row * columns + x1 + 1]):
+            candidates[k] = cell_idx[c]
+            k += 1
+    candidates.sort()
+    return candidates
+
+
+@njit(cache=True)
+def _nearest_in_run(px, py, food_x, food_y, food_alive, cell_start, cell_idx, first, last,
+                    nearest, min_distance_sq):
+    """Fold the living food in cells first..last (one run of cell_idx) into a nearest-food search"""
+    for c in range(cell_start[first], cell_start[last + 1]):
+        j = cell_idx[c]
+        if not food_alive[j]:
+            continue
+        distance_sq = (food_x[j] - px)**2 + (food_y[j] - py)**2
+        if distance_sq < min_distance_sq or (distance_sq == min_distance_sq and j < nearest):
+            min_distance_sq = distance_sq
+            nearest = j
+    return nearest, min_distance_sq
+
+
+@njit(cache=True)
+def _grid_nearest(px, py, max_distance, food_x, food_y, food_alive,
+                  cell_start, cell_idx, columns, rows, cell_size):
+    """Nearest living food within max_distance of a point, -1 if none.
+
+    Visits the grid in square rings of cells around the point's cell. Once rings 0..k are
+    done, every unvisited point is at least k * cell_size away, so the search stops as soon
+    as the best distance is below that or the ring has passed max_distance. Ties go to the
+    lowest row, the same answer as a scan over all rows. Distances are compared squared.
+    """
+    cx = min(max(int(px // cell_size), 0), columns - 1)
+    cy = min(max(int(py // cell_size), 0), rows - 1)
+    max_distance_sq = max_distance * max_distance
+    nearest = -1
+    min_distance_sq = np.inf
+    for ring in range(max(columns, rows)):
+        for gy in range(max(cy - ring, 0), min(cy + ring, rows - 1) + 1):
+            row = gy * columns
+            if gy == cy - ring or gy == cy + ring:
+                # Top and bottom edges of the ring are one contiguous run of cells
+                nearest, min_distance_sq = _nearest_in_run(
+                    px, py, food_x, food_y, food_alive, cell_start, cell_idx,
+                    row + max(cx - ring, 0), row + min(cx + ring, columns - 1), nearest, min_distance_sq)
+            else:
+                if cx - ring >= 0:
+                    nearest, min_distance_sq = _nearest_in_run(
+                        px, py, food_x, food_y, food_alive, cell_start, cell_idx,
+                        row + cx - ring, row + cx - ring, nearest, min_distance_sq)
+                if cx + ring < columns:
+                    nearest, min_distance_sq = _nearest_in_run(
+                        px, py, food_x, food_y, food_alive, cell_start, cell_idx,
+                        row + cx + ring, row + cx + ring, nearest, min_distance_sq)
+        reach = ring * cell_size
+        if min_distance_sq < reach * reach or reach > max_distance:
+            break
+    if min_distance_sq <= max_distance_sq:
+        return nearest
+    return -1
+
+
+@njit(cache=True)
+def _eat_in_range(px, py, success_rate, hunting_range, food_x, food_y, food_alive,
+                  cell_start, cell_idx, columns, rows, cell_size, rng):
+    """Row of the food caught by a hunter at a point, -1 if none.
+
+    Living food within hunting_range is tried in row order, with one success roll each
+    unless success_rate is 1, until a hunt succeeds.
+    """
+    hunting_range_sq = hunting_range * hunting_range
+    candidates = _grid_candidates(px, py, hunting_range, cell_start, cell_idx, columns, rows, cell_size)
+    for j in candidates:
+        if not food_alive[j]:
+            continue
+        if (food_x[j] - px)**2 + (food_y[j] - py)**2 <= hunting_range_sq:
+            if success_rate >= 1.0 or rng.random() < success_rate:
+                return j
+    return -1
+
+
+@njit(cache=True, fastmath=True)
+def hunt_step(x, y, energy, max_energy, alive, hunting_cooldown, success_rates,
+              food_x, food_y, food_energy, food_alive,
+              cell_start, cell_idx, columns, rows, cell_size, random_dx, random_dy, rng,
+              movement_speed, detection_range, hunting_range, hunting_cooldown_duration,
+              world_width, world_height):
+    """Move and feed every living animal of a population on a single food population.
+
+    Animals are processed one at a time in index order, since every meal removes food
+    that later animals could have targeted; the outer loop is therefore not parallel.
+    The food grid (a SpatialGrid of the food) narrows both the nearest-food search and the
+    feeding search to nearby cells.
+    random_dx and random_dy are each animal's step for when it finds no food, drawn for the
+    whole population beforehand. rng is the simulation's np.random.Generator, used for the
+    hunting rolls, whose state Numba advances in place.
+    """
+    for i in range(len(x)):
+        if not alive[i]:
+            continue
+
+        if hunting_cooldown[i] > 0:
+            # Don't move during cooldown
+            hunting_cooldown[i] -= 1
+        else:
+            # Find the nearest living food
+            nearest = _grid_nearest(x[i], y[i], detection_range, food_x, food_y, food_alive,
+                                    cell_start, cell_idx, columns, rows, cell_size)
+
+            # Steps are computed in double precision and rounded once when stored
+            px = np.float64(x[i])
+            py = np.float64(y[i])
+            if nearest >= 0:
+                # Move towards food, unless already on top of it
+                dx = np.float64(food_x[nearest]) - px
+                dy = np.float64(food_y[nearest]) - py
+                min_distance = math.sqrt(dx**2 + dy**2)
+                if min_distance > 0:
+                    x[i] = max(0.0, min(world_width, px + dx / min_distance * movement_speed))
+                    y[i] = max(0.0, min(world_height, py + dy / min_distance * movement_speed))
+            else:
+                # No food found, move randomly
+                x[i] = max(0.0, min(world_width, px + random_dx[i]))
+                y[i] = max(0.0, min(world_height, py + random_dy[i]))
+
+        # Eat at most one food individual within hunting range
+        eaten = _eat_in_range(x[i], y[i], success_rates[i], hunting_range, food_x, food_y, food_alive,
+                              cell_start, cell_idx, columns, rows, cell_size, rng)
+        if eaten >= 0:
+            energy[i] = min(max_energy[i], energy[i] + food_energy[eaten])
+            food_alive[eaten] = False
+            hunting_cooldown[i] = hunting_cooldown_duration
+
+
+def grass_density(x, y, alive, competition_radius, max_possible_grass,
+                  cell_start, cell_idx, columns, rows, cell_size):
+    """Normalized density (0-1) of living grass around every living grass, using a grid of the living grass"""
+    if not _threading_layer_chosen:
+        _choose_threading_layer()
+    return _grass_density(x, y, alive, competition_radius, max_possible_grass,
+                          cell_start, cell_idx, columns, rows, cell_size)
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _grass_density(x, y, alive, competition_radius, max_possible_grass,
+                   cell_start, cell_idx, columns, rows, cell_size):
+    """Parallel kernel behind grass_density"""
+    n = len(x)
+    density = np.zeros(n)
+    radius_squared = competition_radius * competition_radius
+    for i in prange(n):
+        if not alive[i]:
+            continue
+        # Count grass within competition radius, excluding self
+        nearby_grass_count = -1
+        x0, x1, y0, y1 = _cell_bounds(x[i], y[i], competition_radius, columns, rows, cell_size)
+        for row in range(y0, y1 + 1):
+            for c in range(cell_start[row * columns + x0], cell_start[row * columns + x1 + 1]):
+                j = cell_idx[c]
+                if (x[j] - x[i])**2 + (y[j] - y[i])**2 <= radius_squared:
+                    nearby_grass_count += 1
+        density[i] = min(1.0, nearby_grass_count / max_possible_grass)
+    return density
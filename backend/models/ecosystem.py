@@ -3,15 +3,21 @@ Ecosystem Data Model
 Manages the entire ecosystem state and data
 """
 
-import random
+import logging
 import numpy as np
-from typing import List, Dict, Any, Tuple, Optional, Union
+from dataclasses import dataclass, field
+from typing import List, Dict, Tuple, Optional
 from pydantic import BaseModel, Field
 from enum import Enum
 from .species import Grass, Cow, Tiger, Position, Species
+from .population import Population
+from .grid import SpatialGrid
 
 
-# Pydantic Models for Type Safety and C++ Migration
+logger = logging.getLogger(__name__)
+
+
+# Species types and data models for type safety and C++ migration
 class SpeciesType(str, Enum):
     GRASS = "grass"
     COW = "cow"
@@ -36,11 +42,13 @@ class SpeciesPopulationData(BaseModel):
     species_data: Dict[str, List[BaseIndividualData]] = Field(default_factory=dict)
 
 
-class SpeciesStatistics(BaseModel):
-    statistics: Dict[SpeciesType, int] = Field(default_factory=dict)
+@dataclass
+class SpeciesStatistics:
+    # A plain dataclass rather than a Pydantic model: the counters are updated every step
+    # and never need validation
+    statistics: Dict[SpeciesType, int] = field(default_factory=dict)
     
-    def __init__(self, **data):
-        super().__init__(**data)
+    def __post_init__(self):
         # 初始化所有物种的统计为0
         for species_type in SpeciesType:
             if species_type not in self.statistics:
@@ -94,113 +102,157 @@ class SpeciesStatistics(BaseModel):
 class EcosystemStateData(BaseModel):
     world_width: int
     world_height: int
-    grass_list: List[Species]
-    cow_list: List[Species]
-    tiger_list: List[Species]
+    populations: Dict[str, Population] = Field(default_factory=dict)
     time_step: int
-    grass_positions_array: Optional[np.ndarray] = None
-    alive_grass_objects: List[Species] = Field(default_factory=list)
+    rng: Optional[np.random.Generator] = None
+    grids: Dict[str, SpatialGrid] = Field(default_factory=dict)
     
     class Config:
         arbitrary_types_allowed = True  # Allow numpy arrays and custom types
+    
+    def spatial_grid(self, species_name: str) -> SpatialGrid:
+        """Grid over the living individuals of a species, built on first use and shared until invalidated"""
+        grid = self.grids.get(species_name)
+        if grid is None:
+            population = self.populations[species_name]
+            cell_size = SpatialGrid.search_cell_size(int(np.count_nonzero(population.alive)),
+                                                     self.world_width, self.world_height)
+            grid = SpatialGrid.from_population(population, cell_size, self.world_width, self.world_height)
+            self.grids[species_name] = grid
+        return grid
+    
+    def invalidate_grid(self, species_name: str):
+        """Drop the grid of a species whose individuals moved or were born"""
+        self.grids.pop(species_name, None)
+
+
+@dataclass
+class SpeciesSlot:
+    """注册表中一个物种的全部信息"""
+    name: str
+    species_class: type
+    # 模板个体只提供物种参数和种群级行为
+    template: Species
+    population: Population
+    initial_count: int
 
 
 class SpeciesRegistry:
     """物种注册表管理类"""
     
     def __init__(self, config: 'EcosystemConfig'):
-        self._registry = {}
+        self._registry: Dict[str, SpeciesSlot] = {}
         self._register_species('grass', Grass, config.initial_grass)
         self._register_species('cow', Cow, config.initial_cows)
         self._register_species('tiger', Tiger, config.initial_tigers)
     
     def _register_species(self, name: str, species_class: type, initial_count: int):
         """注册一个物种"""
-        self._registry[name] = {
-            'class': species_class,
-            'list': [],
-            'initial_count': initial_count
-        }
+        self._registry[name] = SpeciesSlot(name, species_class, species_class(Position(0, 0)),
+                                           Population(), initial_count)
+        # 物种集合注册后不再变化，缓存供每步遍历使用
+        self._slots = tuple(self._registry.values())
+        self._populations = {slot.name: slot.population for slot in self._slots}
+    
+    def get_all_slots(self) -> Tuple[SpeciesSlot, ...]:
+        """获取所有物种的注册信息（按注册顺序）"""
+        return self._slots
     
-    def get_species_list(self, species_name: str) -> List[Species]:
-        """获取指定物种的列表"""
-        return self._registry[species_name]['list']
+    def get_population(self, species_name: str) -> Population:
+        """获取指定物种的种群数组"""
+        return self._registry[species_name].population
+    
+    def get_all_populations(self) -> Dict[str, Population]:
+        """获取所有物种的种群数组"""
+        return self._populations
     
     def get_species_class(self, species_name: str) -> type:
         """获取指定物种的类"""
-        return self._registry[species_name]['class']
+        return self._registry[species_name].species_class
+    
+    def get_template(self, species_name: str) -> Species:
+        """获取指定物种的模板个体"""
+        return self._registry[species_name].template
     
     def get_initial_count(self, species_name: str) -> int:
         """获取指定物种的初始数量"""
-        return self._registry[species_name]['initial_count']
+        return self._registry[species_name].initial_count
     
     def get_all_species_names(self) -> List[str]:
         """获取所有物种名称"""
         return list(self._registry.keys())
     
-    def add_individual(self, species_name: str, individual: Species):
-        """添加个体到指定物种"""
-        self._registry[species_name]['list'].append(individual)
-    
-    def extend_individuals(self, species_name: str, individuals: List[Species]):
-        """批量添加个体到指定物种"""
-        self._registry[species_name]['list'].extend(individuals)
+    def spawn_individuals(self, species_name: str, xs, ys):
+        """在指定位置批量添加新个体"""
+        slot = self._registry[species_name]
+        slot.population.spawn(xs, ys, slot.template.energy, slot.template.max_energy)
     
     def clear_species(self, species_name: str):
         """清空指定物种"""
-        self._registry[species_name]['list'].clear()
+        self._registry[species_name].population.clear()
     
     def clear_all(self):
         """清空所有物种"""
-        for info in self._registry.values():
-            info['list'].clear()
+        for slot in self._slots:
+            slot.population.clear()
     
     def get_species_count(self, species_name: str) -> int:
-        """获取指定物种的数量"""
-        return len(self._registry[species_name]['list'])
+        """获取指定物种的存活数量"""
+        return int(np.count_nonzero(self._registry[species_name].population.alive))
     
     def get_total_count(self) -> int:
-        """获取所有物种的总数量"""
-        return sum(len(info['list']) for info in self._registry.values())
+        """获取所有物种的存活总数量"""
+        return sum(int(np.count_nonzero(slot.population.alive)) for slot in self._slots)
     
     def filter_alive(self, species_name: str):
-        """过滤掉死亡的个体"""
-        self._registry[species_name]['list'] = [
-            individual for individual in self._registry[species_name]['list'] 
-            if individual.alive
-        ]
+        """过滤掉死亡的个体（死亡个体过半时才压缩数组）"""
+        self._registry[species_name].population.compact()
     
     def filter_all_alive(self):
         """过滤掉所有物种中死亡的个体"""
-        for species_name in self.get_all_species_names():
-            self.filter_alive(species_name)
+        for slot in self._slots:
+            slot.population.compact()
 
 
 class EcosystemConfig:
     """Ecosystem Configuration"""
     def __init__(self, world_width=800, world_height=600, 
-                 initial_grass=100, initial_cows=10, initial_tigers=1):
+                 initial_grass=100, initial_cows=10, initial_tigers=1, seed=None):
         self.world_width = world_width
         self.world_height = world_height
         self.initial_grass = initial_grass
         self.initial_cows = initial_cows
         self.initial_tigers = initial_tigers
+        self.seed = seed  # Random seed, None for a different run every time
 
 
 class EcosystemState:
     """Ecosystem State Management"""
     
+    # Number of time steps kept in the population history
+    HISTORY_LENGTH = 100
+    
     def __init__(self, config: EcosystemConfig):
         self.config = config
         self.time_step = 0
         
+        # Single random generator for the whole simulation, so a seeded run is reproducible
+        self.rng = np.random.default_rng(config.seed)
+        
         # 使用SpeciesRegistry统一管理物种
         self.species_registry = SpeciesRegistry(config)
         
-        # Statistics using Pydantic models
+        # Birth and death counters per species
         self.births = SpeciesStatistics()
         self.deaths = SpeciesStatistics()
-        self.population_history = []
+        self._reset_history()
+        
+        # Running count of living individuals per species, kept in sync by
+        # handle_reproduction and cleanup_dead
+        self._alive_counts: Dict[str, int] = {}
+        
+        # Species data built for the current time step, reused until the next step
+        self._species_data_cache: Optional[Tuple[int, SpeciesPopulationData]] = None
         
         # Initialize populations
         self._initialize_populations()
@@ -208,92 +260,91 @@ class EcosystemState:
     def _initialize_populations(self):
         """Initialize populations using unified logic"""
         for species_name in self.species_registry.get_all_species_names():
-            species_class = self.species_registry.get_species_class(species_name)
             initial_count = self.species_registry.get_initial_count(species_name)
             
-            for _ in range(initial_count):
-                position = Position(
-                    random.randint(0, self.config.world_width),
-                    random.randint(0, self.config.world_height)
-                )
-                individual = species_class(position)
-                self.species_registry.add_individual(species_name, individual)
+            xs = self.rng.integers(0, self.config.world_width, size=initial_count, endpoint=True)
+            ys = self.rng.integers(0, self.config.world_height, size=initial_count, endpoint=True)
+            self.species_registry.spawn_individuals(species_name, xs, ys)
+            self._alive_counts[species_name] = initial_count
     
     def get_ecosystem_state(self) -> EcosystemStateData:
         """Get ecosystem state using Pydantic model for species updates"""
-        # Precompute grass positions for numpy optimization
-        grass_list = self.species_registry.get_species_list('grass')
-        alive_grass_positions = []
-        alive_grass_objects = []
-        for grass in grass_list:
-            if grass.alive:
-                alive_grass_positions.append([grass.position.x, grass.position.y])
-                alive_grass_objects.append(grass)
-        
-        grass_positions_array = np.array(alive_grass_positions) if alive_grass_positions else np.empty((0, 2))
-        
+        # Species read positions straight from the populations, which are handed out by reference
         return EcosystemStateData(
             world_width=self.config.world_width,
             world_height=self.config.world_height,
-            grass_list=self.species_registry.get_species_list('grass'),
-            cow_list=self.species_registry.get_species_list('cow'),
-            tiger_list=self.species_registry.get_species_list('tiger'),
+            populations=self.species_registry.get_all_populations(),
             time_step=self.time_step,
-            grass_positions_array=grass_positions_array,
-            alive_grass_objects=alive_grass_objects
+            rng=self.rng
         )
     
     def update_species(self, ecosystem_state: EcosystemStateData):
-        """Update species lists using unified logic"""
-        for species_name in self.species_registry.get_all_species_names():
-            species_list = self.species_registry.get_species_list(species_name)
-            
-            # Update each individual in the species
-            for individual in species_list[:]:
-                individual.update(ecosystem_state)
-    
-    def handle_reproduction(self):
+        """Update species populations using unified logic"""
+        for slot in self.species_registry.get_all_slots():
+            # Update every individual of the species at once
+            slot.template.update_population(slot.population, ecosystem_state)
+            if slot.template.MOVES:
+                ecosystem_state.invalidate_grid(slot.name)
+    
+    def handle_reproduction(self, ecosystem_state: Optional[EcosystemStateData] = None):
         """Handle reproduction for all species using unified logic"""
-        ecosystem_state = self.get_ecosystem_state()
+        if ecosystem_state is None:
+            ecosystem_state = self.get_ecosystem_state()
         
-        for species_name in self.species_registry.get_all_species_names():
-            species_list = self.species_registry.get_species_list(species_name)
-            new_individuals = []
+        for slot in self.species_registry.get_all_slots():
+            species_name, template, population = slot.name, slot.template, slot.population
             
-            for individual in species_list[:]:
-                if individual.can_reproduce():
-                    offspring = individual.reproduce(ecosystem_state)
-                    if offspring:
-                        new_individuals.append(offspring)
+            parents = np.flatnonzero(template.can_reproduce_population(population, ecosystem_state.rng))
+            new_xs, new_ys = template.reproduce_population(population, ecosystem_state, parents)
             
-            # Add new individuals to the species list
-            self.species_registry.extend_individuals(species_name, new_individuals)
+            # Add new individuals to the species population
+            self.species_registry.spawn_individuals(species_name, new_xs, new_ys)
+            ecosystem_state.invalidate_grid(species_name)
             
             # Record birth counts using enum-driven approach
             species_type = SpeciesType(species_name)
-            self.births.increment(species_type, len(new_individuals))
+            self.births.increment(species_type, len(new_xs))
+            self._alive_counts[species_name] += len(new_xs)
             
             # Log reproduction events
-            if len(new_individuals) > 0:
+            if len(new_xs) > 0 and logger.isEnabledFor(logging.DEBUG):
                 species_emoji = {'grass': '🌱', 'cow': '🐄', 'tiger': '🐅'}
-                print(f"{species_emoji.get(species_name, '🔸')} {len(new_individuals)} new {species_name} individuals born")
+                logger.debug("%s %d new %s individuals born",
+                             species_emoji.get(species_name, '🔸'), len(new_xs), species_name)
+    
+    def _reset_history(self):
+        """Clear the population history ring buffer"""
+        # One row per time step: a count column per species followed by the total
+        self._history = np.zeros((self.HISTORY_LENGTH, len(SpeciesType) + 1), dtype=np.int32)
+        self._history_index = 0
     
     def update_statistics(self):
         """Update statistics"""
-        counts = self.get_species_counts()
-        self.population_history.append(counts.model_dump())
+        row = self._history[self._history_index % self.HISTORY_LENGTH]
+        for column, species_type in enumerate(SpeciesType):
+            row[column] = self._alive_counts.get(species_type.value, 0)
+        row[-1] = row[:-1].sum()
+        self._history_index += 1
+    
+    @property
+    def population_history(self) -> np.ndarray:
+        """Population counts of the recent time steps, oldest first.
         
-        # Keep history data within reasonable range
-        if len(self.population_history) > 100:
-            self.population_history = self.population_history[-100:]
+        Columns follow SpeciesType order, the last column is the total population.
+        """
+        if self._history_index <= self.HISTORY_LENGTH:
+            return self._history[:self._history_index].copy()
+        return np.roll(self._history, -(self._history_index % self.HISTORY_LENGTH), axis=0)
     
     def cleanup_dead(self):
         """Remove dead individuals from all species using unified logic"""
-        for species_name in self.species_registry.get_all_species_names():
-            species_list = self.species_registry.get_species_list(species_name)
+        for slot in self.species_registry.get_all_slots():
+            species_name, population = slot.name, slot.population
             
-            # Count deaths before filtering
-            dead_count = sum(1 for individual in species_list if not individual.alive)
+            # Dead rows are kept until compaction, so deaths are the drop in the living count
+            alive_count = int(np.count_nonzero(population.alive))
+            dead_count = self._alive_counts[species_name] - alive_count
+            self._alive_counts[species_name] = alive_count
             
             # Record death counts using enum-driven approach
             species_type = SpeciesType(species_name)
@@ -304,38 +355,72 @@ class EcosystemState:
             
             # Log deaths if any occurred
             if dead_count > 0:
-                species_emoji = {'grass': '🌱', 'cow': '🐄', 'tiger': '🐅'}
-                print(f"💀 {dead_count} {species_name} individuals died")
+                logger.debug("💀 %d %s individuals died", dead_count, species_name)
     
     def get_species_counts(self) -> SpeciesStatistics:
-        """Get current population counts for all species using Pydantic model"""
+        """Get current population counts for all species"""
         stats = SpeciesStatistics()
-        for species_name in self.species_registry.get_all_species_names():
-            species_type = SpeciesType(species_name)
-            count = self.species_registry.get_species_count(species_name)
-            stats.set_count(species_type, count)
+        for species_name, count in self._alive_counts.items():
+            stats.set_count(SpeciesType(species_name), count)
         return stats
     
+    def get_species_averages(self) -> Dict[str, Dict[str, float]]:
+        """Get the average energy and age of the living individuals of each species"""
+        averages = {}
+        for species_name in self.species_registry.get_all_species_names():
+            population = self.species_registry.get_population(species_name)
+            alive = population.alive
+            count = int(np.count_nonzero(alive))
+            if count == 0:
+                averages[species_name] = {'energy': 0.0, 'age': 0.0}
+                continue
+            # Masked reductions read each array once, without copying out the living rows
+            averages[species_name] = {
+                'energy': float(np.sum(population.energy, where=alive)) / count,
+                'age': float(np.sum(population.age, where=alive)) / count
+            }
+        return averages
+    
+    def get_species_positions(self) -> Dict[str, np.ndarray]:
+        """Get an (N, 2) array of the positions of the living individuals of each species"""
+        return {species_name: self.species_registry.get_population(species_name).positions()
+                for species_name in self.species_registry.get_all_species_names()}
+    
     def get_species_data(self) -> SpeciesPopulationData:
         """Get detailed data for all species using unified Pydantic models"""
+        # The renderer asks for the data every frame, usually several times per time step
+        if self._species_data_cache is not None and self._species_data_cache[0] == self.time_step:
+            return self._species_data_cache[1]
+        
         species_data = SpeciesPopulationData()
         
         # Process all species using unified logic
         for species_name in self.species_registry.get_all_species_names():
-            species_data.species_data[species_name] = []
+            population = self.species_registry.get_population(species_name)
+            alive = population.alive
             
-            for individual in self.species_registry.get_species_list(species_name):
-                if individual.alive:
-                    individual_data = BaseIndividualData(
-                        id=id(individual),
-                        position=PositionData(x=individual.position.x, y=individual.position.y),
-                        energy=individual.energy,
-                        age=individual.age,
-                        alive=individual.alive,
-                        max_energy=individual.max_energy
-                    )
-                    species_data.species_data[species_name].append(individual_data)
+            # Convert each array to Python values once instead of per individual
+            columns = zip(
+                population.id[alive].tolist(),
+                population.x[alive].tolist(),
+                population.y[alive].tolist(),
+                population.energy[alive].tolist(),
+                population.age[alive].tolist(),
+                population.max_energy[alive].tolist()
+            )
+            species_data.species_data[species_name] = [
+                BaseIndividualData(
+                    id=individual_id,
+                    position=PositionData(x=x, y=y),
+                    energy=energy,
+                    age=age,
+                    alive=True,
+                    max_energy=max_energy
+                )
+                for individual_id, x, y, energy, age, max_energy in columns
+            ]
         
+        self._species_data_cache = (self.time_step, species_data)
         return species_data
     
     def reset(self, config: EcosystemConfig = None):
@@ -344,14 +429,16 @@ class EcosystemState:
             self.config = config
         
         self.time_step = 0
+        self.rng = np.random.default_rng(self.config.seed)
+        self._species_data_cache = None
         
         # Clear all species and reinitialize
         self.species_registry.clear_all()
         
-        # Reset statistics using Pydantic models
+        # Reset birth and death counters
         self.births = SpeciesStatistics()
         self.deaths = SpeciesStatistics()
-        self.population_history = []
+        self._reset_history()
         
         # Reinitialize populations
         self._initialize_populations()
@@ -360,8 +447,8 @@ class EcosystemState:
         """Check for extinct species using unified logic"""
         extinct_species = []
         
-        for species_name in self.species_registry.get_all_species_names():
-            if self.species_registry.get_species_count(species_name) == 0:
+        for species_name, count in self._alive_counts.items():
+            if count == 0:
                 extinct_species.append(species_name)
         
         return extinct_species
\ No newline at end of file
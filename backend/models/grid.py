@@ -0,0 +1,113 @@
+"""
+Spatial Grid
+Uniform grid hash over population positions for short-range neighbour queries
+"""
+
+import math
+import numpy as np
+from typing import Optional
+
+
+class SpatialGrid:
+    """Uniform grid over a set of points, bucketed with a counting sort
+
+    The rows of the points in cell c are cell_idx[cell_start[c]:cell_start[c + 1]],
+    in ascending row order. Cells are numbered row-major: c = cell_y * columns + cell_x.
+    """
+
+    # Points per cell aimed for by search_cell_size: a few per cell keeps both the
+    # number of cells visited and the points checked in each one small
+    SITES_PER_CELL = 3
+
+    def __init__(self, positions: np.ndarray, cell_size: float, world_width: int, world_height: int,
+                 mask: Optional[np.ndarray] = None):
+        self.cell_size = float(cell_size)
+        self.columns = int(world_width // self.cell_size) + 1
+        self.rows = int(world_height // self.cell_size) + 1
+
+        # Kept by reference for the distance checks in count_within_radius
+        self.positions = positions
+
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(len(positions))
+        cells = self.cell_of(positions[rows, 0], positions[rows, 1])
+
+        # Counting sort: a stable argsort keeps rows ascending inside each cell
+        order = np.argsort(cells, kind='stable')
+        self.cell_idx = rows[order]
+        counts = np.bincount(cells, minlength=self.columns * self.rows)
+        self.cell_start = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.cell_start[1:])
+
+    @classmethod
+    def from_population(cls, population, cell_size: float, world_width: int, world_height: int) -> 'SpatialGrid':
+        """Grid over the living individuals of a population"""
+        return cls(population.pos, cell_size, world_width, world_height, population.alive)
+
+    @classmethod
+    def search_cell_size(cls, count: int, world_width: int, world_height: int,
+                         min_cell_size: float = 1.0) -> float:
+        """Cell size that puts about SITES_PER_CELL of count uniformly spread points in each cell"""
+        if count == 0:
+            return float(max(world_width, world_height, min_cell_size))
+        return max(float(min_cell_size), math.sqrt(world_width * world_height * cls.SITES_PER_CELL / count))
+
+    def cell_of(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Cell number of each position"""
+        # Cells are always computed in double precision, like the bounds of the queries
+        cell_x = np.clip((xs.astype(np.float64) // self.cell_size).astype(np.int64), 0, self.columns - 1)
+        cell_y = np.clip((ys.astype(np.float64) // self.cell_size).astype(np.int64), 0, self.rows - 1)
+        return cell_y * self.columns + cell_x
+
+    def query_radius(self, x: float, y: float, radius: float) -> np.ndarray:
+        """Rows in the cells overlapping a circle, in ascending order.
+
+        These are candidates only: callers still check the exact distance.
+        """
+        x = float(x)
+        y = float(y)
+        x0 = min(max(int((x - radius) // self.cell_size), 0), self.columns - 1)
+        x1 = min(max(int((x + radius) // self.cell_size), 0), self.columns - 1)
+        y0 = min(max(int((y - radius) // self.cell_size), 0), self.rows - 1)
+        y1 = min(max(int((y + radius) // self.cell_size), 0), self.rows - 1)
+
+        cell_start = self.cell_start
+        buckets = [self.cell_idx[cell_start[row * self.columns + x0]:cell_start[row * self.columns + x1 + 1]]
+                   for row in range(y0, y1 + 1)]
+        # Each row of cells is one contiguous run of cell_idx; sort a copy, never cell_idx itself
+        return np.sort(np.concatenate(buckets))
+
+    def count_within_radius(self, xs: np.ndarray, ys: np.ndarray, radius: float) -> np.ndarray:
+        """Number of grid points within radius of each query point, counted in one batch.
+
+        For every cell offset that can reach the radius, each query is paired with all points
+        of the cell at that offset from its own, and the pairs within range are counted.
+        """
+        counts = np.zeros(len(xs), dtype=np.int64)
+        radius_sq = radius * radius
+        reach = int(math.ceil(radius / self.cell_size))
+        cells = self.cell_of(xs, ys)
+        cell_x = cells % self.columns
+        cell_y = cells // self.columns
+        cell_counts = np.diff(self.cell_start)
+
+        for offset_y in range(-reach, reach + 1):
+            for offset_x in range(-reach, reach + 1):
+                neighbour_x = cell_x + offset_x
+                neighbour_y = cell_y + offset_y
+                queries = np.flatnonzero((neighbour_x >= 0) & (neighbour_x < self.columns) &
+                                         (neighbour_y >= 0) & (neighbour_y < self.rows))
+                cells = neighbour_y[queries] * self.columns + neighbour_x[queries]
+                lengths = cell_counts[cells]
+                total = int(lengths.sum())
+                if total == 0:
+                    continue
+
+                # One pair per (query, point in its neighbour cell)
+                owners = np.repeat(queries, lengths)
+                within_cell = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+                members = self.cell_idx[np.repeat(self.cell_start[cells], lengths) + within_cell]
+                inside = ((self.positions[members, 0] - xs[owners])**2 +
+                          (self.positions[members, 1] - ys[owners])**2 <= radius_sq)
+                counts += np.bincount(owners[inside], minlength=len(xs))
+
+        return counts
@@ -0,0 +1,134 @@
+"""
+Population Data Model
+Stores all individuals of one species as a Structure-of-Arrays (one numpy array per field)
+"""
+
+import numpy as np
+from typing import Dict
+
+
+class Population:
+    """Structure-of-Arrays storage for all individuals of a species
+
+    Rows live in preallocated arrays that double in capacity when full. Dead
+    individuals stay in place (alive is False) until compact() drops them, so
+    births and deaths do not reallocate the arrays every step. The public field
+    attributes are views of the first len(self) rows.
+    """
+
+    # Per-individual fields and their dtypes, kept as narrow as the values allow:
+    # energy is fractional (grass growth) so it stays floating point, while ages
+    # (max_age <= 8000) and cooldowns (<= 800 steps) fit in int16. Ids are handed out
+    # once at birth and never reused, unlike row numbers which change on compaction
+    FIELDS: Dict[str, type] = {
+        'id': np.int64,
+        'energy': np.float32,
+        'max_energy': np.float32,
+        'age': np.int16,
+        'alive': np.bool_,
+        'reproduction_cooldown': np.int16,
+        'hunting_cooldown': np.int16,
+    }
+    # Single precision is ample for coordinates within the world (at most a few thousand
+    # units across) and halves the bytes read by every distance check
+    POSITION_DTYPE = np.float32
+    INITIAL_CAPACITY = 64
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows allocated"""
+        return len(self._pos)
+
+    @property
+    def x(self) -> np.ndarray:
+        """View of the x coordinates"""
+        return self.pos[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        """View of the y coordinates"""
+        return self.pos[:, 1]
+
+    def clear(self):
+        """Remove all individuals"""
+        self._size = 0
+        self._next_id = 0
+        # Positions live in one (N, 2) array so they can be handed out without copying
+        self._pos = np.empty((self.INITIAL_CAPACITY, 2), dtype=self.POSITION_DTYPE)
+        self._fields = {name: np.empty(self.INITIAL_CAPACITY, dtype=dtype)
+                        for name, dtype in self.FIELDS.items()}
+        self._bind_views()
+
+    def _bind_views(self):
+        """Point the public field attributes at the rows in use"""
+        size = self._size
+        self.pos = self._pos[:size]
+        for name, storage in self._fields.items():
+            setattr(self, name, storage[:size])
+
+    def _reserve(self, capacity: int):
+        """Grow the storage to hold at least capacity rows, doubling as needed"""
+        new_capacity = self.capacity
+        if capacity <= new_capacity:
+            return
+        while new_capacity < capacity:
+            new_capacity *= 2
+
+        size = self._size
+        pos = np.empty((new_capacity, 2), dtype=self.POSITION_DTYPE)
+        pos[:size] = self._pos[:size]
+        self._pos = pos
+        for name, dtype in self.FIELDS.items():
+            storage = np.empty(new_capacity, dtype=dtype)
+            storage[:size] = self._fields[name][:size]
+            self._fields[name] = storage
+
+    def spawn(self, xs, ys, energy: float, max_energy: float):
+        """Append new individuals at the given positions"""
+        count = len(xs)
+        if count == 0:
+            return
+
+        start = self._size
+        end = start + count
+        self._reserve(end)
+
+        self._pos[start:end, 0] = xs
+        self._pos[start:end, 1] = ys
+        self._fields['id'][start:end] = np.arange(self._next_id, self._next_id + count)
+        self._next_id += count
+        self._fields['energy'][start:end] = energy
+        self._fields['max_energy'][start:end] = max_energy
+        self._fields['age'][start:end] = 0
+        self._fields['alive'][start:end] = True
+        self._fields['reproduction_cooldown'][start:end] = 0
+        self._fields['hunting_cooldown'][start:end] = 0
+
+        self._size = end
+        self._bind_views()
+
+    def compress(self, mask: np.ndarray):
+        """Keep only the individuals selected by a boolean mask"""
+        # Copy the mask first, it may be a view of the alive rows that are about to move
+        mask = np.array(mask, dtype=bool)
+        keep = int(np.count_nonzero(mask))
+        self._pos[:keep] = self.pos[mask]
+        for name in self.FIELDS:
+            self._fields[name][:keep] = getattr(self, name)[mask]
+        self._size = keep
+        self._bind_views()
+
+    def compact(self, min_alive_fraction: float = 0.5):
+        """Drop dead rows once fewer than min_alive_fraction of the rows are alive"""
+        if np.count_nonzero(self.alive) < self._size * min_alive_fraction:
+            self.compress(self.alive)
+
+    def positions(self) -> np.ndarray:
+        """Get an (N, 2) array of the positions of living individuals"""
+        return self.pos[self.alive]
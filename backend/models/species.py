@@ -3,11 +3,13 @@ Species Data Model
 Defines the base species class and specific species implementations in the ecosystem
 """
 
-import random
 import math
 import numpy as np
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Optional, List, Tuple
 from dataclasses import dataclass
+from .population import Population
+from .grid import SpatialGrid
+from . import _kernels
 
 
 @dataclass
@@ -22,79 +24,62 @@ class Position:
 
 
 class Species:
-    """Species base class"""
+    """Species base class
+    
+    An instance holds the parameters of a species. Its individuals live in a Population
+    (Structure-of-Arrays storage), which the methods below update all at once.
+    """
+    
+    # Whether update_population moves individuals, which makes their spatial grid stale
+    MOVES = False
+    
     def __init__(self, position: Position, energy: int = 100, max_age: int = 100, reproduction_energy_cost: int = 50):
         self.position = position
         self.energy = reproduction_energy_cost
         self.max_energy = energy*4
-        self.age = 0
         self.max_age = max_age
-        self.alive = True
-        self.reproduction_cooldown = 0
-        self.death_reason = None  # Record the reason for death
-        self.species_name = self.__class__.__name__  # Store species name for logging
         self.reproduction_energy_cost = reproduction_energy_cost
     
-    def update(self, ecosystem_state: Dict[str, Any]) -> None:
-        """Update species state"""
-        if not self.alive:
-            return
-        
-        # Reduce reproduction cooldown
-        if self.reproduction_cooldown > 0:
-            self.reproduction_cooldown -= 1
-    
-    def can_reproduce(self) -> bool:
-        """Check if can reproduce"""
-        return self.alive and self.energy >= self.reproduction_energy_cost*2 and self.reproduction_cooldown <= 0
-    
-    def reproduce(self, ecosystem_state: Dict[str, Any]) -> Optional['Species']:
-        """Reproduce to create new individual"""
-        return None
-    
-    def move_randomly(self, world_width: int, world_height: int, speed: float = 1.0) -> None:
-        """Random movement"""
-        if not self.alive:
-            return
-        
-        # Random direction
-        angle = random.uniform(0, 2 * math.pi)
-        dx = math.cos(angle) * speed
-        dy = math.sin(angle) * speed
-        
-        # Update position with boundary constraints
-        self.position.x = max(0, min(world_width, self.position.x + dx))
-        self.position.y = max(0, min(world_height, self.position.y + dy))
-    
-    def age_one_step(self) -> None:
-        """Age increases by one step"""
-        self.age += 1
-        if self.age >= self.max_age:
-            self.die_from_old_age()
+    def update_population(self, population: Population, ecosystem_state) -> None:
+        """Update every living individual of a population"""
+        # Reduce reproduction cooldown, in place: subtracting the mask takes one off where it is set
+        cooling = population.alive & (population.reproduction_cooldown > 0)
+        population.reproduction_cooldown -= cooling
     
-    def die(self, reason: str = "Unknown") -> None:
-        """Death with reason"""
-        if self.alive:  # Only record death reason once
-            self.alive = False
-            self.death_reason = reason
-            
+    def age_population(self, population: Population) -> None:
+        """Age every living individual by one step"""
+        alive = population.alive
+        population.age[alive] += 1
+        population.alive[alive & (population.age >= self.max_age)] = False
     
-    def die_from_old_age(self) -> None:
-        """Death from old age"""
-        self.die("Old age")
+    def can_reproduce_population(self, population: Population, rng: np.random.Generator) -> np.ndarray:
+        """Boolean mask of the individuals that can reproduce"""
+        return (population.alive &
+                (population.energy >= self.reproduction_energy_cost*2) &
+                (population.reproduction_cooldown <= 0))
     
-    def die_from_starvation(self) -> None:
-        """Death from starvation"""
-        self.die("Starvation")
+    def reproduce_population(self, population: Population, ecosystem_state,
+                             parents: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Reproduce the given parent indices, returning the offspring positions"""
+        return np.empty(0), np.empty(0)
     
-    def die_from_predation(self, predator_name: str) -> None:
-        """Death from being eaten by predator"""
-        self.die(f"Predation by {predator_name}")
+    def offspring_positions(self, population: Population, parents: np.ndarray, spread: float,
+                            ecosystem_state) -> Tuple[np.ndarray, np.ndarray]:
+        """Random positions within spread of each parent, clamped to the world"""
+        offsets = ecosystem_state.rng.uniform(-spread, spread, size=(len(parents), 2))
+        new_xs = np.clip(population.x[parents] + offsets[:, 0], 0, ecosystem_state.world_width)
+        new_ys = np.clip(population.y[parents] + offsets[:, 1], 0, ecosystem_state.world_height)
+        return new_xs, new_ys
 
 
 class Animal(Species):
     """Animal base class - inherits from Species and adds intelligent movement"""
     
+    MOVES = True
+    
+    # Animals per distance matrix in nearest_food_batch
+    NEAREST_BATCH_SIZE = 256
+    
     def __init__(self, position: Position, energy: int = 100, max_age: int = 100, reproduction_energy_cost: int = 50,
                  movement_speed: float = 1.0, energy_consumption: int = 1, hunting_range: float = 5.0,
                  hunting_success_rate: float = 0.5, detection_range: float = 500.0, 
@@ -106,80 +91,167 @@ class Animal(Species):
         self.hunting_success_rate = hunting_success_rate
         self.detection_range = detection_range
         self.food_types = food_types if food_types is not None else []
-        self.hunting_cooldown = 0  # Cooldown after hunting/eating
         self.hunting_cooldown_duration = hunting_cooldown_duration
+        # Ranges are compared against squared distances, which saves a square root per pair
+        self.detection_range_squared = detection_range ** 2
+        self.hunting_range_squared = hunting_range ** 2
     
-    def find_nearest_food(self, ecosystem_state) -> Optional[Position]:
-        """Find the nearest food source"""
-        nearest_food = None
-        min_distance = float('inf')
-        
-        for food_type in self.food_types:
-            # Access Pydantic model attributes instead of dict.get()
-            if food_type == 'grass':
-                food_list = ecosystem_state.grass_list
-            elif food_type == 'cow':
-                food_list = ecosystem_state.cow_list
-            elif food_type == 'tiger':
-                food_list = ecosystem_state.tiger_list
-            else:
-                food_list = []
-                
-            for food in food_list:
-                if food.alive:
-                    distance = self.position.distance_to(food.position)
-                    if distance <= self.detection_range and distance < min_distance:
-                        min_distance = distance
-                        nearest_food = food.position
-        
-        return nearest_food
-    
-    def move_towards_target(self, target_position: Position, world_width: int, world_height: int) -> None:
-        """Move towards a target position"""
-        if not self.alive:
-            return
-        
-        # Calculate direction to target
-        dx = target_position.x - self.position.x
-        dy = target_position.y - self.position.y
-        distance = math.sqrt(dx**2 + dy**2)
-        
-        if distance > 0:
-            # Normalize direction and apply speed
+    def update_population(self, population: Population, ecosystem_state) -> None:
+        """Update every living animal of a population"""
+        # Call parent update first to handle reproduction cooldown
+        super().update_population(population, ecosystem_state)
+
+        success_rates = self.hunting_success_rates(population)
+        alive = population.alive.copy()
+
+        # Consume energy
+        population.energy[alive] -= self.energy_consumption
+
+        # Random steps for the whole species in one draw; an animal only takes its own if it finds no food
+        angles = ecosystem_state.rng.uniform(0, 2 * math.pi, size=len(population))
+        random_dx = np.cos(angles) * self.movement_speed
+        random_dy = np.sin(angles) * self.movement_speed
+
+        # Move and eat one animal at a time, as every meal changes the food left for the next animal
+        food_populations = [ecosystem_state.populations[food_type] for food_type in self.food_types]
+        # Food does not move while this species updates, so the food grids of the step stay valid
+        food_grids = [ecosystem_state.spatial_grid(food_type) for food_type in self.food_types]
+        if _kernels.JIT_ENABLED and len(food_populations) == 1:
+            food = food_populations[0]
+            grid = food_grids[0]
+            _kernels.hunt_step(population.x, population.y, population.energy, population.max_energy,
+                               alive, population.hunting_cooldown, success_rates,
+                               food.x, food.y, food.energy, food.alive,
+                               grid.cell_start, grid.cell_idx, grid.columns, grid.rows, grid.cell_size,
+                               random_dx, random_dy, ecosystem_state.rng,
+                               self.movement_speed, self.detection_range, self.hunting_range,
+                               self.hunting_cooldown_duration,
+                               ecosystem_state.world_width, ecosystem_state.world_height)
+        else:
+            indices = np.flatnonzero(alive)
+            # Nearest food of every animal in one batch; the food set only shrinks during the
+            # step, so a batch target that is still alive is still the nearest one
+            target_foods, target_rows = self.nearest_food_batch(population, indices, food_populations)
+            for i, target_food, target_row in zip(indices, target_foods, target_rows):
+                if population.hunting_cooldown[i] > 0:
+                    # Don't move during cooldown
+                    population.hunting_cooldown[i] -= 1
+                else:
+                    if target_food >= 0 and not food_populations[target_food].alive[target_row]:
+                        # Target was eaten earlier in this step, look again
+                        target_food, target_row = self.nearest_food(population, i, food_populations)
+                    target = food_populations[target_food].pos[target_row] if target_food >= 0 else None
+                    self.move_individual(population, i, target, (random_dx[i], random_dy[i]),
+                                         ecosystem_state.world_width, ecosystem_state.world_height)
+
+                self.feed_individual(population, i, food_populations, food_grids, success_rates[i],
+                                     ecosystem_state.rng)
+
+        # Age increases
+        self.age_population(population)
+
+        # Death check
+        population.alive[population.alive & (population.energy <= 0)] = False
+
+    def hunting_success_rates(self, population: Population) -> np.ndarray:
+        """Hunting success rate of every individual"""
+        return np.full(len(population), self.hunting_success_rate)
+
+    def nearest_food_batch(self, population: Population, indices: np.ndarray,
+                           food_populations: List[Population]) -> Tuple[np.ndarray, np.ndarray]:
+        """Nearest living food within detection range of each given animal.
+
+        Returns the index into food_populations and the food row for every animal, -1 if none.
+        """
+        target_foods = np.full(len(indices), -1)
+        target_rows = np.full(len(indices), -1)
+        min_distances_sq = np.full(len(indices), np.inf)
+
+        for k, food in enumerate(food_populations):
+            food_rows = np.flatnonzero(food.alive)
+            if len(food_rows) == 0:
+                continue
+            food_x = food.x[food_rows]
+            food_y = food.y[food_rows]
+
+            # Squared distance matrix in chunks of animals to bound memory
+            for start in range(0, len(indices), self.NEAREST_BATCH_SIZE):
+                chunk = slice(start, start + self.NEAREST_BATCH_SIZE)
+                animals = indices[chunk]
+                distances_sq = ((food_x[None, :] - population.x[animals, None])**2 +
+                                (food_y[None, :] - population.y[animals, None])**2)
+                nearest = np.argmin(distances_sq, axis=1)
+                nearest_distances_sq = distances_sq[np.arange(len(animals)), nearest]
+
+                closer = (nearest_distances_sq <= self.detection_range_squared) & (nearest_distances_sq < min_distances_sq[chunk])
+                min_distances_sq[chunk] = np.where(closer, nearest_distances_sq, min_distances_sq[chunk])
+                target_foods[chunk] = np.where(closer, k, target_foods[chunk])
+                target_rows[chunk] = np.where(closer, food_rows[nearest], target_rows[chunk])
+
+        return target_foods, target_rows
+
+    def nearest_food(self, population: Population, i: int,
+                     food_populations: List[Population]) -> Tuple[int, int]:
+        """Nearest living food within detection range of one animal, (-1, -1) if none"""
+        x = population.x[i]
+        y = population.y[i]
+
+        target = (-1, -1)
+        min_distance_sq = float('inf')
+        for k, food in enumerate(food_populations):
+            if len(food) == 0:
+                continue
+            # Measure against every row and rule out the dead, instead of copying the living positions
+            distances_sq = (food.x - x)**2 + (food.y - y)**2
+            distances_sq[~food.alive] = np.inf
+            nearest = np.argmin(distances_sq)
+            if distances_sq[nearest] <= self.detection_range_squared and distances_sq[nearest] < min_distance_sq:
+                min_distance_sq = distances_sq[nearest]
+                target = (k, nearest)
+
+        return target
+
+    def move_individual(self, population: Population, i: int, target: Optional[np.ndarray],
+                        random_step: Tuple[float, float], world_width: int, world_height: int) -> None:
+        """Move one animal towards its target food, or by its random step if there is none"""
+        # Steps are computed in double precision and rounded once when stored
+        x = float(population.x[i])
+        y = float(population.y[i])
+
+        if target is not None:
+            # Move towards food
+            dx = float(target[0]) - x
+            dy = float(target[1]) - y
+            distance = math.sqrt(dx**2 + dy**2)
+            if distance <= 0:
+                return
             dx = (dx / distance) * self.movement_speed
             dy = (dy / distance) * self.movement_speed
-            
-            # Update position with boundary constraints
-            self.position.x = max(0, min(world_width, self.position.x + dx))
-            self.position.y = max(0, min(world_height, self.position.y + dy))
-    
-    def intelligent_move(self, ecosystem_state) -> None:
-        """Intelligent movement - move towards food if available, otherwise move randomly"""
-        if not self.alive:
-            return
-        
-        # Check if in hunting cooldown (stay still)
-        if self.hunting_cooldown > 0:
-            self.hunting_cooldown -= 1
-            return  # Don't move during cooldown
-        
-        # Access Pydantic model attributes
-        world_width = ecosystem_state.world_width
-        world_height = ecosystem_state.world_height
-        
-        # Try to find food
-        nearest_food = self.find_nearest_food(ecosystem_state)
-        
-        if nearest_food:
-            # Move towards food
-            self.move_towards_target(nearest_food, world_width, world_height)
         else:
             # No food found, move randomly
-            self.move_randomly(world_width, world_height, self.movement_speed)
-    
-    def start_hunting_cooldown(self) -> None:
-        """Start hunting cooldown - animal will stay still for a period"""
-        self.hunting_cooldown = self.hunting_cooldown_duration
+            dx, dy = float(random_step[0]), float(random_step[1])
+
+        # Update position with boundary constraints
+        population.x[i] = max(0, min(world_width, x + dx))
+        population.y[i] = max(0, min(world_height, y + dy))
+
+    def feed_individual(self, population: Population, i: int, food_populations: List[Population],
+                        food_grids: List[SpatialGrid], success_rate: float,
+                        rng: np.random.Generator) -> None:
+        """Let one animal eat at most one food individual within hunting range"""
+        x = population.x[i]
+        y = population.y[i]
+        for food, grid in zip(food_populations, food_grids):
+            candidates = grid.query_radius(x, y, self.hunting_range)
+            distances_sq = (food.x[candidates] - x)**2 + (food.y[candidates] - y)**2
+            for j in candidates[food.alive[candidates] & (distances_sq <= self.hunting_range_squared)]:
+                # Attempt to hunt
+                if success_rate >= 1.0 or rng.random() < success_rate:
+                    # Successful hunt, gain energy
+                    population.energy[i] = min(population.max_energy[i], population.energy[i] + food.energy[j])
+                    food.alive[j] = False
+                    population.hunting_cooldown[i] = self.hunting_cooldown_duration
+                    return  # Only eat one food individual at a time
 
 
 class Grass(Species):
@@ -190,152 +262,83 @@ class Grass(Species):
         self.base_growth_rate = 0.9  # Slightly increased base growth rate
         self.reproduction_chance = 0.4  # Reduced reproduction chance to balance density
         self.competition_radius = 30.0  # Increased competition radius for more realistic effect
+        # Computed once: the density is normalized by the grass count a full competition circle could hold
+        self.max_possible_grass = math.pi * self.competition_radius ** 2 / 400
         self.max_competition_effect = 0.9  # Reduced max competition effect for better balance
     
-    def calculate_nearby_grass_density_optimized(self, ecosystem_state) -> float:
-        """Calculate the density of grass in the nearby area using precomputed numpy arrays"""
-        # Access Pydantic model attributes
-        grass_positions_array = getattr(ecosystem_state, 'grass_positions_array', np.empty((0, 2)))
-        alive_grass_objects = getattr(ecosystem_state, 'alive_grass_objects', [])
-        
-        if grass_positions_array.size == 0:
-            return 0.0
-        
-        # Find the index of self in alive_grass_objects to exclude it
-        self_index = -1
-        for i, grass in enumerate(alive_grass_objects):
-            if grass is self:
-                self_index = i
-                break
-        
-        # Create a mask to exclude self from calculations
-        if self_index >= 0:
-            mask = np.ones(len(grass_positions_array), dtype=bool)
-            mask[self_index] = False
-            filtered_positions = grass_positions_array[mask]
-        else:
-            filtered_positions = grass_positions_array
-        
-        if filtered_positions.size == 0:
-            return 0.0
-        
-        # Vectorized distance calculation
-        self_position = np.array([self.position.x, self.position.y])
-        distances = np.linalg.norm(filtered_positions - self_position, axis=1)
-        
-        # Count grass within competition radius
-        nearby_grass_count = np.sum(distances <= self.competition_radius)
-        
-        # Return normalized density (0-1 scale)
-        max_possible_grass = math.pi * (self.competition_radius ** 2) / 400
-        density = min(1.0, nearby_grass_count / max_possible_grass)
-        
-        return density
+    def calculate_population_density(self, population: Population, ecosystem_state) -> np.ndarray:
+        """Calculate the nearby grass density of every living grass"""
+        max_possible_grass = self.max_possible_grass
+        alive = population.alive
+        grid = ecosystem_state.spatial_grid('grass')
+        if _kernels.JIT_ENABLED:
+            return _kernels.grass_density(population.x, population.y, alive,
+                                          self.competition_radius, max_possible_grass,
+                                          grid.cell_start, grid.cell_idx, grid.columns, grid.rows,
+                                          grid.cell_size)
+
+        density = np.zeros(len(population))
+        rows = np.flatnonzero(alive)
+        # Count living grass within competition radius, excluding self; the grid only holds
+        # the living grass, so dead rows are never counted
+        nearby_grass_count = grid.count_within_radius(population.x[rows], population.y[rows],
+                                                      self.competition_radius) - 1
 
-    def calculate_nearby_grass_density(self, ecosystem_state) -> float:
-        """Calculate the density of grass in the nearby area using numpy optimization"""
-        # Use optimized version if precomputed arrays are available
-        if hasattr(ecosystem_state, 'grass_positions_array'):
-            return self.calculate_nearby_grass_density_optimized(ecosystem_state)
-        
-        # Fallback to original implementation
-        grass_list = ecosystem_state.grass_list
-        
-        if not grass_list:
-            return 0.0
-        
-        # Extract positions of all alive grass (excluding self)
-        alive_grass_positions = []
-        for grass in grass_list:
-            if grass != self and grass.alive:
-                alive_grass_positions.append([grass.position.x, grass.position.y])
-        
-        if not alive_grass_positions:
-            return 0.0
-        
-        # Convert to numpy array for vectorized computation
-        grass_positions = np.array(alive_grass_positions)
-        self_position = np.array([self.position.x, self.position.y])
-        
-        # Vectorized distance calculation
-        distances = np.linalg.norm(grass_positions - self_position, axis=1)
-        
-        # Count grass within competition radius
-        nearby_grass_count = np.sum(distances <= self.competition_radius)
-        
         # Return normalized density (0-1 scale)
-        # Higher values mean more competition
-        max_possible_grass = math.pi * (self.competition_radius ** 2) / 100  # Assume 1 grass per 200 units area
-        density = min(1.0, nearby_grass_count / max_possible_grass)
-        
+        density[rows] = np.minimum(1.0, nearby_grass_count / max_possible_grass)
+
         return density
-    
-    def get_competition_adjusted_growth_rate(self, ecosystem_state: Dict[str, Any]) -> float:
-        """Calculate growth rate adjusted for local competition"""
-        density = self.calculate_nearby_grass_density(ecosystem_state)
-        
-        # Growth rate decreases with higher density
-        # Formula: growth_rate = base_rate * (1 - density * max_competition_effect)
-        competition_factor = 1.0 - (density**0.3 * self.max_competition_effect)
-        if density == 0:
-            competition_factor = 2.0
-        adjusted_growth_rate = self.base_growth_rate * competition_factor
-        
-        # Ensure growth rate doesn't go below 10% of base rate
-        min_growth_rate = self.base_growth_rate * 0.01
-        return max(min_growth_rate, adjusted_growth_rate)
-
-    def update(self, ecosystem_state: Dict[str, Any]) -> None:
-        """Update grass state"""
+
+    def update_population(self, population: Population, ecosystem_state) -> None:
+        """Update every living grass of a population"""
         # Call parent update first to handle reproduction cooldown
-        super().update(ecosystem_state)
-        
-        if not self.alive:
-            return
-        
+        super().update_population(population, ecosystem_state)
+
+        alive = population.alive
+
         # Calculate competition-adjusted growth rate
-        adjusted_growth_rate = self.get_competition_adjusted_growth_rate(ecosystem_state)
-        
+        density = self.calculate_population_density(population, ecosystem_state)
+        competition_factor = np.where(density == 0, 2.0, 1.0 - (density**0.3 * self.max_competition_effect))
+        adjusted_growth_rate = np.maximum(self.base_growth_rate * 0.01, self.base_growth_rate * competition_factor)
+
         # Growth gains energy based on competition
-        self.energy = min(self.max_energy, self.energy + adjusted_growth_rate)
-        
+        population.energy[alive] = np.minimum(population.max_energy[alive],
+                                              population.energy[alive] + adjusted_growth_rate[alive])
+
         # Age increases
-        self.age_one_step()
-        
-        # Death check from old age - handled by age_one_step() now
-        if self.age >= self.max_age:
-            self.die()
-    
-    def can_reproduce(self) -> bool:
-        """Check if can reproduce"""
-        return (super().can_reproduce() and 
-                random.random() < self.reproduction_chance)
-    
-    def reproduce(self, ecosystem_state) -> Optional['Grass']:
-        """Reproduce to create new grass"""
-        super().reproduce(ecosystem_state)
-        
-        if not self.can_reproduce():
-            return None
-        
-        # Generate new grass at nearby random position
-        # Access Pydantic model attributes
+        self.age_population(population)
+
+    def can_reproduce_population(self, population: Population, rng: np.random.Generator) -> np.ndarray:
+        """Boolean mask of the grass that can reproduce"""
+        ready = super().can_reproduce_population(population, rng)
+        # Only roll for the grass that passes the energy and cooldown checks
+        candidates = np.flatnonzero(ready)
+        ready[candidates] = rng.random(len(candidates)) < self.reproduction_chance
+        return ready
+
+    def reproduce_population(self, population: Population, ecosystem_state,
+                             parents: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Reproduce the given parent grass, returning the offspring positions"""
+        # The parents already passed can_reproduce_population(); its chance roll is made a
+        # second time here, so grass reproduces with reproduction_chance squared
+        rng = ecosystem_state.rng
+        parents = parents[rng.random(len(parents)) < self.reproduction_chance]
+
         world_width = ecosystem_state.world_width
         world_height = ecosystem_state.world_height
-        
-        new_x = max(0, min(world_width, self.position.x + random.uniform(-200, 200)))
-        new_y = max(0, min(world_height, self.position.y + random.uniform(-200, 200)))
-        
-        if new_x <= 0 or new_x >= world_width or new_y <= 0 or new_y >= world_height:
-            return None
-        
+
+        # Generate new grass at nearby random positions
+        new_xs, new_ys = self.offspring_positions(population, parents, 200, ecosystem_state)
+
+        # Offspring that would land on the world boundary are not born
+        inside = (new_xs > 0) & (new_xs < world_width) & (new_ys > 0) & (new_ys < world_height)
+        parents = parents[inside]
+
         # Consume energy
-        self.energy -= self.reproduction_energy_cost
-        self.reproduction_cooldown = 10
+        population.energy[parents] -= self.reproduction_energy_cost
+        population.reproduction_cooldown[parents] = 10
 
-        
-        new_position = Position(new_x, new_y)
-        return Grass(new_position)
+        return new_xs[inside], new_ys[inside]
 
 
 class Cow(Animal):
@@ -354,68 +357,24 @@ class Cow(Animal):
                         food_types=['grass'],
                         hunting_cooldown_duration=0,
                         )
-        # Keep eating_range for backward compatibility if needed elsewhere
-        self.eating_range = self.hunting_range
-    
-    def update(self, ecosystem_state) -> None:
-        """Update cow state"""
-        # Call parent update first to handle reproduction cooldown
-        super().update(ecosystem_state)
-        
-        if not self.alive:
-            return
-        
-        # Intelligent movement - move towards grass if available
-        self.intelligent_move(ecosystem_state)
-        
-        # Consume energy
-        self.energy -= self.energy_consumption
-        
-        # Find and eat grass
-        self._eat_grass(ecosystem_state.grass_list)
-        
-        # Age increases
-        self.age_one_step()
-        
-        # Death check
-        if self.energy <= 0:
-            self.die_from_starvation()
     
-    def _eat_grass(self, grass_list: List['Grass']) -> None:
-        """Eat grass"""
-        for grass in grass_list:
-            # Double check: grass must be alive and within eating range
-            if grass.alive and self.position.distance_to(grass.position) <= self.eating_range:
-                # Eat grass, gain energy
-                self.energy = min(self.max_energy, self.energy + grass.energy)
-                grass.die_from_predation("Cow")
-                break  # Only eat one grass at a time
-    
-    def can_reproduce(self) -> bool:
-        """Check if can reproduce"""
-        return (super().can_reproduce() and 
-                self.age > 20)
-    
-    def reproduce(self, ecosystem_state: Dict[str, Any]) -> Optional['Cow']:
-        """Reproduce to create new cow"""
-        super().reproduce(ecosystem_state)
-        
-        if not self.can_reproduce():
-            return None
-        
+    def can_reproduce_population(self, population: Population, rng: np.random.Generator) -> np.ndarray:
+        """Boolean mask of the cows that can reproduce"""
+        return (super().can_reproduce_population(population, rng) &
+                (population.age > 20))
+
+    def reproduce_population(self, population: Population, ecosystem_state,
+                             parents: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Reproduce the given parent cows, returning the offspring positions"""
+        rng = ecosystem_state.rng
+        parents = parents[self.can_reproduce_population(population, rng)[parents]]
+
         # Consume energy
-        self.energy -= self.reproduction_energy_cost
-        self.reproduction_cooldown = 200
-        
-        # Generate new cow at nearby random position
-        world_width = ecosystem_state.world_width
-        world_height = ecosystem_state.world_height
-        
-        new_x = max(0, min(world_width, self.position.x + random.uniform(-10, 10)))
-        new_y = max(0, min(world_height, self.position.y + random.uniform(-10, 10)))
-        
-        new_position = Position(new_x, new_y)
-        return Cow(new_position)
+        population.energy[parents] -= self.reproduction_energy_cost
+        population.reproduction_cooldown[parents] = 200
+
+        # Generate new cows at nearby random positions
+        return self.offspring_positions(population, parents, 10, ecosystem_state)
 
 
 class Tiger(Animal):
@@ -434,72 +393,25 @@ class Tiger(Animal):
                         food_types=['cow'],
                         hunting_cooldown_duration=4)
     
-    def update(self, ecosystem_state: Dict[str, Any]) -> None:
-        """Update tiger state"""
-        # Call parent update first to handle reproduction cooldown
-        super().update(ecosystem_state)
-        
-        if self.energy <= self.reproduction_energy_cost/3:
-            # self.movement_speed = 3.8 + 0.1+0.3*(1 - self.age/self.max_age)
-            self.hunting_success_rate = 0.2+0.6*(1 - self.age/self.max_age)
-        else:
-            # self.movement_speed = 4.0
-            self.hunting_success_rate = 0.2
-        
-        if not self.alive:
-            return
-        
-        # Intelligent movement - move towards cows if available
-        self.intelligent_move(ecosystem_state)
-        
-        # Consume energy
-        self.energy -= self.energy_consumption
-        
-        # Find and hunt cows
-        self._hunt_cows(ecosystem_state.cow_list)
-        
-        # Age increases
-        self.age_one_step()
-        
-        # Death check
-        if self.energy <= 0:
-            self.die_from_starvation()
-    
-    def _hunt_cows(self, cow_list: List['Cow']) -> None:
-        """Hunt cows"""
-        for cow in cow_list:
-            if cow.alive and self.position.distance_to(cow.position) <= self.hunting_range:
-                # Attempt to hunt
-                if random.random() < self.hunting_success_rate:
-                    # Successful hunt, gain energy
-                    self.energy = min(self.max_energy, self.energy + cow.energy)
-                    cow.die_from_predation("Tiger")
-                    # Start hunting cooldown - tiger will stay still for a period
-                    self.start_hunting_cooldown()
-                    break  # Only hunt one cow at a time
-    
-    def can_reproduce(self) -> bool:
-        """Check if can reproduce"""
-        return (super().can_reproduce() and 
-                self.age > 30)
-    
-    def reproduce(self, ecosystem_state: Dict[str, Any]) -> Optional['Tiger']:
-        """Reproduce to create new tiger"""
-        super().reproduce(ecosystem_state)
-        
-        if not self.can_reproduce():
-            return None
-        
+    def hunting_success_rates(self, population: Population) -> np.ndarray:
+        """Hungry tigers hunt harder, and young hungry tigers hunt best"""
+        hungry = population.energy <= self.reproduction_energy_cost/3
+        return np.where(hungry, 0.2+0.6*(1 - population.age/self.max_age), 0.2)
+
+    def can_reproduce_population(self, population: Population, rng: np.random.Generator) -> np.ndarray:
+        """Boolean mask of the tigers that can reproduce"""
+        return (super().can_reproduce_population(population, rng) &
+                (population.age > 30))
+
+    def reproduce_population(self, population: Population, ecosystem_state,
+                             parents: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Reproduce the given parent tigers, returning the offspring positions"""
+        rng = ecosystem_state.rng
+        parents = parents[self.can_reproduce_population(population, rng)[parents]]
+
         # Consume energy
-        self.energy -= self.reproduction_energy_cost
-        self.reproduction_cooldown = 800
-        
-        # Generate new tiger at nearby random position
-        world_width = ecosystem_state.world_width
-        world_height = ecosystem_state.world_height
-        
-        new_x = max(0, min(world_width, self.position.x + random.uniform(-40, 40)))
-        new_y = max(0, min(world_height, self.position.y + random.uniform(-40, 40)))
-        
-        new_position = Position(new_x, new_y)
-        return Tiger(new_position)
\ No newline at end of file
+        population.energy[parents] -= self.reproduction_energy_cost
+        population.reproduction_cooldown[parents] = 800
+
+        # Generate new tigers at nearby random positions
+        return self.offspring_positions(population, parents, 40, ecosystem_state)
\ No newline at end of file
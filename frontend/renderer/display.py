@@ -4,22 +4,64 @@ Handles the rendering of the ecosystem simulation using Pygame
 """
 
 import pygame
+import numpy as np
 import sys
-from typing import Dict, Any, List, Optional
-from backend.models.species import Grass, Cow, Tiger
+from typing import Dict, Any, List, Optional, Tuple
 
 
 class DisplayRenderer:
     """Display renderer class"""
     
-    def __init__(self, width: int = 800, height: int = 600):
-        """Initialize display renderer"""
+    # Frame rate limit of the main loop
+    FPS = 60
+    
+    # Timer event posted when the simulation is due for its next step
+    STEP_EVENT = pygame.USEREVENT + 1
+    
+    # Event types the app reacts to; everything else is dropped by SDL before it is queued
+    HANDLED_EVENT_TYPES = (pygame.QUIT, pygame.KEYDOWN, STEP_EVENT)
+    
+    # Beyond this many changed areas a frame is sent to the display whole
+    DIRTY_RECT_LIMIT = 1000
+    
+    # Number of rendered stat values kept for reuse
+    TEXT_CACHE_SIZE = 128
+    
+    # Key presses and the event each one raises
+    KEY_EVENTS = {
+        pygame.K_SPACE: 'pause',
+        pygame.K_r: 'reset',
+        pygame.K_UP: 'speed_up',
+        pygame.K_DOWN: 'speed_down',
+    }
+    
+    def __init__(self, width: int = 800, height: int = 600, render_scale: int = 1):
+        """Initialize display renderer
+        
+        Args:
+            width: Window width in pixels
+            height: Window height in pixels
+            render_scale: Factor by which the world is drawn at reduced resolution and then
+                scaled up to the window, trading detail for fewer pixels written per frame;
+                the UI is always drawn at full resolution
+        """
         pygame.init()
         self.width = width
         self.height = height
+        self.render_scale = render_scale
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("Ecosystem Simulation")
         
+        # Surface the world is drawn on, the screen itself at full resolution
+        if render_scale > 1:
+            self.world_surface = pygame.Surface((width // render_scale, height // render_scale))
+        else:
+            self.world_surface = self.screen
+        
+        # Keep mouse motion and window events out of the queue
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self.HANDLED_EVENT_TYPES)
+        
         # Colors
         self.colors = {
             'background': (34, 139, 34),  # Forest green
@@ -30,6 +72,16 @@ class DisplayRenderer:
             'panel': (50, 50, 50),        # Dark gray
         }
         
+        # Circle radius of each species, drawn in this order
+        self.radii = {'grass': 3, 'cow': 8, 'tiger': 12}
+        
+        # One pre-drawn circle per species, so a frame is a single blits() call per species
+        # instead of one draw.circle() call per individual
+        self.sprites = {
+            species_name: self._make_circle(self.colors[species_name], max(1, radius // render_scale))
+            for species_name, radius in self.radii.items()
+        }
+        
         # Font
         try:
             self.font = pygame.font.Font(None, 24)
@@ -38,122 +90,189 @@ class DisplayRenderer:
             self.font = pygame.font.SysFont('arial', 24)
             self.small_font = pygame.font.SysFont('arial', 18)
         
+        # The control instructions never change, so they are rendered once
+        control_texts = [
+            "Controls:",
+            "SPACE - Pause/Resume",
+            "R - Reset",
+            "UP/DOWN - Speed"
+        ]
+        self.control_surfaces = [self.small_font.render(text, True, self.colors['text'])
+                                 for text in control_texts]
+        
+        # Stat labels are fixed; only the values after them are rendered as they change
+        self.stat_label_surfaces = {label: self.font.render(f"{label}: ", True, self.colors['text'])
+                                    for label in ("Time", "Grass", "Cows", "Tigers", "Speed")}
+        
+        # The stats panel background and border never change, so they are drawn once
+        self.panel_surface = pygame.Surface((250, 150))
+        self.panel_surface.fill(self.colors['panel'])
+        pygame.draw.rect(self.panel_surface, self.colors['text'], self.panel_surface.get_rect(), 2)
+        
+        # Rendered stat values by text, oldest first
+        self._text_cache: Dict[str, pygame.Surface] = {}
+        
+        # Screen areas drawn on in the current and previous frame; None until the whole
+        # screen has been sent to the display
+        self._dirty_rects: List[pygame.Rect] = []
+        self._previous_rects: Optional[List[pygame.Rect]] = None
+        
+        # Message shown over the simulation and the tick count it expires at
+        self._message: Optional[Tuple[str, int]] = None
+        
         self.clock = pygame.time.Clock()
         self.running = True
     
-    def handle_events(self) -> Dict[str, Any]:
-        """Handle pygame events"""
+    def handle_events(self, timeout: int = 0) -> Dict[str, Any]:
+        """Handle pygame events
+        
+        Args:
+            timeout: Milliseconds to block waiting for an event when none is queued;
+                0 only polls the queue
+        """
         events = {
             'quit': False,
             'pause': False,
             'reset': False,
             'speed_up': False,
-            'speed_down': False
+            'speed_down': False,
+            'step': False
         }
         
-        for event in pygame.event.get():
+        if timeout > 0:
+            # Let the process sleep until input arrives, then take the rest of the queue with it
+            event = pygame.event.wait(timeout)
+            pending = [event] + pygame.event.get() if event.type != pygame.NOEVENT else []
+        else:
+            pending = pygame.event.get()
+        
+        for event in pending:
             if event.type == pygame.QUIT:
                 events['quit'] = True
+            elif event.type == self.STEP_EVENT:
+                # Several pending timer events still make a single step
+                events['step'] = True
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    events['pause'] = True
-                elif event.key == pygame.K_r:
-                    events['reset'] = True
-                elif event.key == pygame.K_UP:
-                    events['speed_up'] = True
-                elif event.key == pygame.K_DOWN:
-                    events['speed_down'] = True
+                name = self.KEY_EVENTS.get(event.key)
+                if name is not None:
+                    events[name] = True
         
         return events
     
     def render(self, ecosystem_state: Dict[str, Any], simulation_stats: Dict[str, Any]) -> None:
         """Render the ecosystem"""
+        self._dirty_rects = []
+        
         # Clear screen
-        self.screen.fill(self.colors['background'])
+        self.world_surface.fill(self.colors['background'])
         
         # Render species
         self._render_species(ecosystem_state)
+        if self.world_surface is not self.screen:
+            pygame.transform.scale(self.world_surface, (self.width, self.height), self.screen)
         
         # Render UI
         self._render_ui(simulation_stats)
         
-        # Update display
-        pygame.display.flip()
-        self.clock.tick(60)  # 60 FPS
+        # Message overlay, until it expires
+        message = self.current_message()
+        if message is not None:
+            self._render_message(message)
+        
+        # Update display. Apart from the background only the sprites and the UI were drawn,
+        # so it is enough to send where they are now and where they were last frame
+        if self.world_surface is not self.screen or self._previous_rects is None:
+            pygame.display.flip()
+        else:
+            changed = self._previous_rects + self._dirty_rects
+            if len(changed) > self.DIRTY_RECT_LIMIT:
+                pygame.display.flip()
+            else:
+                pygame.display.update(changed)
+        self._previous_rects = self._dirty_rects
+    
+    def wait_for_frame(self) -> None:
+        """Sleep until the next frame is due"""
+        self.clock.tick(self.FPS)
     
     def _render_species(self, ecosystem_state: Dict[str, Any]) -> None:
         """Render all species"""
-        # Get species data from ecosystem state
-        species_data = ecosystem_state.get('species_data', {})
-        
-        # Render grass
-        grass_data = species_data.species_data.get('grass', [])
-        for grass in grass_data:
-            pygame.draw.circle(
-                self.screen, 
-                self.colors['grass'],
-                (int(grass.position.x), int(grass.position.y)),
-                3
-            )
-        
-        # Render cows
-        cow_data = species_data.species_data.get('cow', [])
-        for cow in cow_data:
-            pygame.draw.circle(
-                self.screen,
-                self.colors['cow'],
-                (int(cow.position.x), int(cow.position.y)),
-                8
-            )
-        
-        # Render tigers
-        tiger_data = species_data.species_data.get('tiger', [])
-        for tiger in tiger_data:
-            pygame.draw.circle(
-                self.screen,
-                self.colors['tiger'],
-                (int(tiger.position.x), int(tiger.position.y)),
-                12
-            )
+        # Positions of each species as an (N, 2) array
+        positions = ecosystem_state.get('positions')
+        if positions is None:
+            # Fall back to the per-individual species data
+            species_data = ecosystem_state.get('species_data')
+            positions = {
+                species_name: [(individual.position.x, individual.position.y) for individual in individuals]
+                for species_name, individuals in species_data.species_data.items()
+            } if species_data is not None else {}
+        
+        # Render grass, then cows, then tigers on top
+        for species_name in self.radii:
+            sprite = self.sprites[species_name]
+            radius = sprite.get_width() // 2
+            # Top-left corners of the sprites centred on each individual
+            corners = np.asarray(positions.get(species_name, []), dtype=int) // self.render_scale - radius
+            self._dirty_rects.extend(self.world_surface.blits([(sprite, corner) for corner in corners.tolist()]))
+    
+    @staticmethod
+    def _make_circle(color, radius: int) -> pygame.Surface:
+        """Draw a filled circle on a transparent surface of its own"""
+        sprite = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        return sprite
     
     def _render_ui(self, stats: Dict[str, Any]) -> None:
         """Render user interface"""
         # Background panel
-        panel_rect = pygame.Rect(10, 10, 250, 150)
-        pygame.draw.rect(self.screen, self.colors['panel'], panel_rect)
-        pygame.draw.rect(self.screen, self.colors['text'], panel_rect, 2)
+        self._dirty_rects.append(self.screen.blit(self.panel_surface, (10, 10)))
         
-        # Statistics text
+        # Statistics text: the fixed label, then its value
         y_offset = 20
-        texts = [
-            f"Time: {stats.get('time', 0)}",
-            f"Grass: {stats.get('grass_count', 0)}",
-            f"Cows: {stats.get('cow_count', 0)}",
-            f"Tigers: {stats.get('tiger_count', 0)}",
-            f"Speed: {stats.get('speed', 1)}x"
+        values = [
+            ("Time", stats.get('time', 0)),
+            ("Grass", stats.get('grass_count', 0)),
+            ("Cows", stats.get('cow_count', 0)),
+            ("Tigers", stats.get('tiger_count', 0)),
+            ("Speed", f"{stats.get('speed', 1)}x")
         ]
         
-        for text in texts:
-            text_surface = self.font.render(text, True, self.colors['text'])
-            self.screen.blit(text_surface, (20, y_offset))
+        for label, value in values:
+            label_surface = self.stat_label_surfaces[label]
+            self._dirty_rects.append(self.screen.blit(label_surface, (20, y_offset)))
+            value_surface = self._render_text(str(value))
+            self._dirty_rects.append(self.screen.blit(value_surface, (20 + label_surface.get_width(), y_offset)))
             y_offset += 25
         
         # Control instructions
-        control_texts = [
-            "Controls:",
-            "SPACE - Pause/Resume",
-            "R - Reset",
-            "UP/DOWN - Speed"
-        ]
-        
         y_offset = self.height - 100
-        for text in control_texts:
-            text_surface = self.small_font.render(text, True, self.colors['text'])
+        for text_surface in self.control_surfaces:
             self.screen.blit(text_surface, (20, y_offset))
             y_offset += 20
     
+    def _render_text(self, text: str) -> pygame.Surface:
+        """Render a stat value, reusing the surface if the same text was rendered recently"""
+        text_surface = self._text_cache.get(text)
+        if text_surface is None:
+            if len(self._text_cache) >= self.TEXT_CACHE_SIZE:
+                # Evict the oldest entry
+                del self._text_cache[next(iter(self._text_cache))]
+            text_surface = self.font.render(text, True, self.colors['text'])
+            self._text_cache[text] = text_surface
+        return text_surface
+    
     def show_message(self, message: str, duration: int = 2000) -> None:
-        """Display message on screen"""
+        """Display message on screen for duration milliseconds, drawn over the following frames"""
+        self._message = (message, pygame.time.get_ticks() + duration)
+    
+    def current_message(self) -> Optional[str]:
+        """Text of the message on display, None once it has expired"""
+        if self._message is not None and pygame.time.get_ticks() >= self._message[1]:
+            self._message = None
+        return self._message[0] if self._message is not None else None
+    
+    def _render_message(self, message: str) -> None:
+        """Render a message in the middle of the screen"""
         text_surface = self.font.render(message, True, self.colors['text'])
         text_rect = text_surface.get_rect(center=(self.width // 2, self.height // 2))
         
@@ -161,11 +280,9 @@ class DisplayRenderer:
         bg_rect = text_rect.inflate(20, 10)
         pygame.draw.rect(self.screen, self.colors['panel'], bg_rect)
         pygame.draw.rect(self.screen, self.colors['text'], bg_rect, 2)
+        self._dirty_rects.append(bg_rect)
         
         self.screen.blit(text_surface, text_rect)
-        pygame.display.flip()
-        
-        pygame.time.wait(duration)
     
     def cleanup(self) -> None:
         """Clean up resources"""
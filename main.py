@@ -6,9 +6,8 @@ A comprehensive ecosystem simulation featuring grass, cows, and tigers
 
 import sys
 import os
+import argparse
 import pygame
-import time
-from typing import Dict, Any
 
 # Add project root to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -21,8 +20,12 @@ from frontend.renderer.display import DisplayRenderer
 class EcosystemApp:
     """Main application class for the ecosystem simulation"""
     
-    def __init__(self):
-        """Initialize the ecosystem application"""
+    def __init__(self, render_scale: int = 1):
+        """Initialize the ecosystem application
+        
+        Args:
+            render_scale: Factor by which the world is drawn at reduced resolution, see DisplayRenderer
+        """
         # Initialize Pygame
         pygame.init()
         
@@ -39,14 +42,16 @@ class EcosystemApp:
         self.simulation_engine = SimulationEngine(self.config)
         self.display_renderer = DisplayRenderer(
             self.config.world_width, 
-            self.config.world_height
+            self.config.world_height,
+            render_scale
         )
         
         # Application state
         self.running = True
         self.paused = False
         self.simulation_speed = 1.0
-        self.last_update_time = time.time()
+        self.last_rendered_frame = None  # (time step, speed, message) of the frame on screen
+        self._schedule_steps()
         
         print("Ecosystem Simulation Initialized Successfully!")
         print("Controls:")
@@ -61,37 +66,47 @@ class EcosystemApp:
         print("Starting ecosystem simulation...")
         
         while self.running:
-            current_time = time.time()
-            
-            # Handle events
-            self._handle_events()
-            
-            # Update simulation
-            if not self.paused:
-                dt = (current_time - self.last_update_time) * self.simulation_speed
-                if dt >= 1.0 / 60.0:  # 60 FPS update rate
-                    self.simulation_engine.step()
-                    self.last_update_time = current_time
+            if self.paused:
+                # Nothing moves while paused, so block on the event queue rather than
+                # waking up every frame
+                self._handle_events(timeout=100)
+            else:
+                # Wait for the frame first, then read input: the events handled are then as
+                # fresh as possible when the step and the render below act on them
+                self.display_renderer.wait_for_frame()
+                
+                # Handle events, stepping the simulation when its timer has fired
+                self._handle_events()
             
             # Render
             self._render()
-            
-            # Small delay to prevent excessive CPU usage
-            time.sleep(0.01)
         
         self._cleanup()
     
-    def _handle_events(self) -> None:
-        """Handle user input events"""
-        events = self.display_renderer.handle_events()
+    def _schedule_steps(self) -> None:
+        """Start, restart or stop the step timer to match the pause state and speed"""
+        if self.paused:
+            interval = 0  # Stops the timer
+        else:
+            # 60 steps per second at 1x speed
+            interval = max(1, round(1000 / (60 * self.simulation_speed)))
+        pygame.time.set_timer(self.display_renderer.STEP_EVENT, interval)
+    
+    def _handle_events(self, timeout: int = 0) -> None:
+        """Handle user input events, waiting up to timeout milliseconds for one"""
+        events = self.display_renderer.handle_events(timeout)
         
         if events['quit']:
             self.running = False
         
+        if events['step'] and not self.paused:
+            self.simulation_engine.step()
+        
         if events['pause']:
             self.paused = not self.paused
             status = "Paused" if self.paused else "Resumed"
             print(f"Simulation {status}")
+            self._schedule_steps()
         
         if events['reset']:
             self._reset_simulation()
@@ -99,16 +114,25 @@ class EcosystemApp:
         if events['speed_up']:
             self.simulation_speed = min(5.0, self.simulation_speed + 0.5)
             print(f"Simulation speed: {self.simulation_speed}x")
+            self._schedule_steps()
         
         if events['speed_down']:
             self.simulation_speed = max(0.1, self.simulation_speed - 0.5)
             print(f"Simulation speed: {self.simulation_speed}x")
+            self._schedule_steps()
     
     def _render(self) -> None:
         """Render the current state"""
-        # Get simulation data
-        data = self.simulation_engine.get_data()
-        ecosystem_state = data['ecosystem_state']
+        # The screen only changes when the simulation steps, the shown speed changes or a
+        # message appears or expires, so skip redrawing an identical frame
+        frame = (self.simulation_engine.ecosystem.time_step, self.simulation_engine.simulation_speed,
+                 self.display_renderer.current_message())
+        if frame == self.last_rendered_frame:
+            return
+        self.last_rendered_frame = frame
+        
+        # Get simulation data; drawing only needs positions, not the per-individual models
+        data = self.simulation_engine.get_data(include_individuals=False)
         species_counts = data['species_counts']
         
         # Prepare simulation statistics
@@ -120,9 +144,9 @@ class EcosystemApp:
             'speed': data['simulation_speed']
         }
         
-        # Prepare ecosystem state with species data
+        # Prepare ecosystem state with species positions
         ecosystem_display_data = {
-            'species_data': ecosystem_state
+            'positions': data['positions']
         }
         
         # Render the display
@@ -131,9 +155,13 @@ class EcosystemApp:
     def _reset_simulation(self) -> None:
         """Reset the simulation to initial state"""
         print("Resetting simulation...")
-        self.simulation_engine = SimulationEngine(self.config)
+        # Reset the engine in place: it stops its own thread before swapping in the new
+        # ecosystem, whereas replacing the engine would leave a running thread behind
+        self.simulation_engine.reset(self.config)
+        self.last_rendered_frame = None
         self.paused = False
         self.simulation_speed = 1.0
+        self._schedule_steps()
         print("Simulation reset complete!")
     
     def _cleanup(self) -> None:
@@ -144,8 +172,13 @@ class EcosystemApp:
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Ecosystem Simulation")
+    parser.add_argument('--render-scale', type=int, default=1,
+                        help="draw the world at 1/N resolution and scale it up to the window (default: 1)")
+    args = parser.parse_args()
+    
     try:
-        app = EcosystemApp()
+        app = EcosystemApp(render_scale=max(1, args.render_scale))
         app.run()
     except KeyboardInterrupt:
         print("\nSimulation interrupted by user")
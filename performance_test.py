@@ -4,55 +4,97 @@
 import time
 import numpy as np
 from backend.models.species import Grass, Position
-from backend.models.ecosystem import EcosystemState
+from backend.models.population import Population
+from backend.models.grid import SpatialGrid
+from backend.models import _kernels
 
-def create_test_grass_list(num_grass=1000):
-    """创建测试用的草列表"""
-    grass_list = []
-    for i in range(num_grass):
-        x = np.random.uniform(0, 800)
-        y = np.random.uniform(0, 600)
-        grass = Grass(Position(x, y))
-        grass_list.append(grass)
-    return grass_list
+def create_test_population(num_grass=1000):
+    """创建测试用的草种群"""
+    # 一次生成所有坐标（每行依次为x、y）
+    positions = np.random.uniform(0, [800, 600], size=(num_grass, 2))
+    template = Grass(Position(0, 0))
+    population = Population()
+    population.spawn(positions[:, 0], positions[:, 1], template.energy, template.max_energy)
+    return population
 
-def test_original_method(grass_list, test_grass):
-    """测试原始方法的性能"""
-    # 模拟原始的ecosystem_state（不包含预计算数组）
-    ecosystem_state = {
-        'grass_list': grass_list,
-        'cow_list': [],
-        'tiger_list': []
-    }
+def build_grid(grass_positions):
+    """在800x600的世界上为草的坐标构建空间网格"""
+    cell_size = SpatialGrid.search_cell_size(len(grass_positions), 800, 600)
+    return SpatialGrid(grass_positions, cell_size, 800, 600)
+
+def test_original_method(grass_positions, test_grass):
+    """测试原始方法的性能：单棵草的查询扫描所有草（作为参考结果）"""
+    radius = test_grass.competition_radius
+    max_possible_grass = test_grass.max_possible_grass
+    px, py = grass_positions[0]
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     for _ in range(100):  # 重复100次测试
-        density = test_grass.calculate_nearby_grass_density(ecosystem_state)
-    end_time = time.time()
+        distances_sq = (grass_positions[:, 0] - px)**2 + (grass_positions[:, 1] - py)**2
+        # 半径内的草数量（不含自身）
+        nearby_grass_count = np.count_nonzero(distances_sq <= radius ** 2) - 1
+        density = min(1.0, nearby_grass_count / max_possible_grass)
+    end_time = time.perf_counter()
     
     return end_time - start_time, density
 
-def test_optimized_method(grass_list, test_grass):
-    """测试优化后方法的性能"""
-    # 创建包含预计算数组的ecosystem_state
-    alive_grass = [g for g in grass_list if g.alive]
-    grass_positions = np.array([[g.position.x, g.position.y] for g in alive_grass])
+def test_grid_method(grass_positions, test_grass):
+    """测试网格方法的性能：单棵草的查询只检查附近网格中的草"""
+    radius = test_grass.competition_radius
+    max_possible_grass = test_grass.max_possible_grass
+    px, py = grass_positions[0]
     
-    ecosystem_state = {
-        'grass_list': grass_list,
-        'cow_list': [],
-        'tiger_list': [],
-        'grass_positions_array': grass_positions,
-        'alive_grass_objects': alive_grass
-    }
+    # 空间网格在计时之外构建，与模拟中每个时间步构建一次相同
+    grid = build_grid(grass_positions)
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     for _ in range(100):  # 重复100次测试
-        density = test_grass.calculate_nearby_grass_density(ecosystem_state)
-    end_time = time.time()
+        candidates = grid.query_radius(px, py, radius)
+        distances_sq = (grass_positions[candidates, 0] - px)**2 + (grass_positions[candidates, 1] - py)**2
+        # 半径内的草数量（不含自身）
+        nearby_grass_count = np.count_nonzero(distances_sq <= radius ** 2) - 1
+        density = min(1.0, nearby_grass_count / max_possible_grass)
+    end_time = time.perf_counter()
     
     return end_time - start_time, density
 
+def test_bulk_method(grass_positions, test_grass):
+    """测试批量方法的性能：一次查询计算所有草的密度"""
+    radius = test_grass.competition_radius
+    max_possible_grass = test_grass.max_possible_grass
+    
+    # 空间网格在计时之外构建，与模拟中每个时间步构建一次相同
+    grid = build_grid(grass_positions)
+    
+    start_time = time.perf_counter()
+    for _ in range(100):  # 重复100次测试
+        # 半径内的草数量（不含自身）
+        nearby_grass_count = grid.count_within_radius(grass_positions[:, 0], grass_positions[:, 1], radius) - 1
+        densities = np.minimum(1.0, nearby_grass_count / max_possible_grass)
+    end_time = time.perf_counter()
+    
+    return end_time - start_time, densities
+
+def test_jit_method(grass_positions, test_grass):
+    """测试编译内核的性能：与批量方法相同的查询，由Numba内核逐棵草并行计算"""
+    radius = test_grass.competition_radius
+    max_possible_grass = test_grass.max_possible_grass
+    alive = np.ones(len(grass_positions), dtype=bool)
+    
+    grid = build_grid(grass_positions)
+    args = (grass_positions[:, 0], grass_positions[:, 1], alive, radius, max_possible_grass,
+            grid.cell_start, grid.cell_idx, grid.columns, grid.rows, grid.cell_size)
+    
+    # 首次调用包含编译时间，放在计时之外
+    _kernels.grass_density(*args)
+    
+    start_time = time.perf_counter()
+    for _ in range(100):  # 重复100次测试
+        densities = _kernels.grass_density(*args)
+    end_time = time.perf_counter()
+    
+    return end_time - start_time, densities
+
 def main():
     print("🧪 开始性能测试...")
     
@@ -62,29 +104,45 @@ def main():
     for size in test_sizes:
         print(f"\n📊 测试草数量: {size}")
         
-        # 创建测试数据
-        grass_list = create_test_grass_list(size)
-        test_grass = grass_list[0]  # 使用第一个草作为测试对象
+        # 创建测试数据：存活草的坐标，以第一棵草作为单棵查询的对象
+        grass_positions = create_test_population(size).positions()
+        test_grass = Grass(Position(0, 0))  # 只提供草的参数（竞争半径和密度的归一化）
         
         # 测试原始方法
-        original_time, original_density = test_original_method(grass_list, test_grass)
+        original_time, original_density = test_original_method(grass_positions, test_grass)
         print(f"   原始方法: {original_time:.4f}秒, 密度: {original_density:.4f}")
         
-        # 测试优化方法
-        optimized_time, optimized_density = test_optimized_method(grass_list, test_grass)
-        print(f"   优化方法: {optimized_time:.4f}秒, 密度: {optimized_density:.4f}")
+        # 测试网格方法（单棵草查询）
+        grid_time, grid_density = test_grid_method(grass_positions, test_grass)
+        print(f"   网格方法: {grid_time:.4f}秒, 密度: {grid_density:.4f}")
         
         # 计算性能提升
-        if original_time > 0:
-            speedup = original_time / optimized_time
+        if grid_time > 0:
+            speedup = original_time / grid_time
             print(f"   🚀 性能提升: {speedup:.2f}x")
         
-        # 验证结果一致性
-        density_diff = abs(original_density - optimized_density)
-        if density_diff < 1e-10:
+        # 验证结果一致性（两种方法对相同的坐标计数，结果应完全相同）
+        if original_density == grid_density:
             print(f"   ✅ 结果一致性: 通过")
         else:
-            print(f"   ❌ 结果一致性: 失败 (差异: {density_diff})")
+            density_diff = abs(original_density - grid_density)
+            print(f"   ❌ 结果一致性: 失败 (原始: {original_density:.6f}, 网格: {grid_density:.6f}, 差异: {density_diff})")
+        
+        # 测试批量方法（每次查询计算全部草的密度）
+        bulk_time, bulk_densities = test_bulk_method(grass_positions, test_grass)
+        print(f"   批量方法: {bulk_time:.4f}秒 (每次{size}棵草), 密度: {bulk_densities[0]:.4f}")
+        print(f"   ⏱️ 平均每棵草: 网格方法 {grid_time / 100 * 1e6:.2f}微秒, 批量方法 {bulk_time / (100 * size) * 1e6:.2f}微秒")
+        
+        # 测试编译内核（需要Numba，且未设置ECOSYS_JIT=0）
+        if _kernels.JIT_ENABLED:
+            jit_time, jit_densities = test_jit_method(grass_positions, test_grass)
+            print(f"   编译内核: {jit_time:.4f}秒 (每次{size}棵草), 密度: {jit_densities[0]:.4f}")
+            if np.allclose(jit_densities, bulk_densities):
+                print(f"   ✅ 编译内核与批量方法一致")
+            else:
+                print(f"   ❌ 编译内核与批量方法不一致")
+        else:
+            print(f"   编译内核: 跳过（Numba不可用或已禁用）")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
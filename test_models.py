@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+数据模型测试文件
+Tests for the population storage, spatial grid and simulation kernels
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.models.population import Population
+from backend.models.grid import SpatialGrid
+from backend.models import _kernels
+from backend.engine.simulation import SimulationEngine
+from backend.models.ecosystem import EcosystemConfig, EcosystemStateData
+from backend.models.species import Grass, Position
+
+
+class TestPopulation(unittest.TestCase):
+    """测试种群的数组存储"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.population = Population()
+
+    def spawn(self, count, offset=0.0):
+        """在对角线上生成count个个体"""
+        xs = np.arange(count, dtype=float) + offset
+        self.population.spawn(xs, xs * 2, energy=10, max_energy=40)
+
+    def test_spawn(self):
+        """测试生成个体"""
+        self.spawn(3)
+        self.spawn(2, offset=100.0)
+
+        self.assertEqual(len(self.population), 5)
+        np.testing.assert_array_equal(self.population.id, np.arange(5))
+        np.testing.assert_array_equal(self.population.x, [0, 1, 2, 100, 101])
+        np.testing.assert_array_equal(self.population.y, [0, 2, 4, 200, 202])
+        self.assertTrue(self.population.alive.all())
+        np.testing.assert_array_equal(self.population.energy, 10)
+        np.testing.assert_array_equal(self.population.max_energy, 40)
+        np.testing.assert_array_equal(self.population.age, 0)
+
+    def test_spawn_grows_capacity(self):
+        """测试超出容量时扩容并保留已有数据"""
+        count = Population.INITIAL_CAPACITY + 1
+        self.spawn(count)
+
+        self.assertGreaterEqual(self.population.capacity, count)
+        self.assertEqual(len(self.population), count)
+        np.testing.assert_array_equal(self.population.id, np.arange(count))
+        np.testing.assert_array_equal(self.population.x, np.arange(count))
+
+    def test_positions_skips_dead(self):
+        """测试positions只返回存活个体"""
+        self.spawn(4)
+        self.population.alive[[1, 3]] = False
+
+        np.testing.assert_array_equal(self.population.positions(), [[0, 0], [2, 4]])
+
+    def test_compact_keeps_alive_rows(self):
+        """测试压缩后保留存活个体的id、坐标和数量"""
+        self.spawn(6)
+        self.population.energy[:] = np.arange(6)
+        self.population.alive[[0, 2, 3, 5]] = False
+
+        self.population.compact()
+
+        self.assertEqual(len(self.population), 2)
+        self.assertTrue(self.population.alive.all())
+        np.testing.assert_array_equal(self.population.id, [1, 4])
+        np.testing.assert_array_equal(self.population.energy, [1, 4])
+        np.testing.assert_array_equal(self.population.pos, [[1, 2], [4, 8]])
+
+    def test_compact_waits_for_enough_dead(self):
+        """测试存活比例足够时不压缩"""
+        self.spawn(4)
+        self.population.alive[0] = False
+
+        self.population.compact()
+
+        self.assertEqual(len(self.population), 4)
+        self.assertEqual(np.count_nonzero(self.population.alive), 3)
+
+    def test_ids_not_reused_after_compact(self):
+        """测试压缩后新个体的id不重复"""
+        self.spawn(4)
+        self.population.alive[:3] = False
+        self.population.compact()
+        self.spawn(2)
+
+        np.testing.assert_array_equal(self.population.id, [3, 4, 5])
+
+    def test_clear(self):
+        """测试清空种群"""
+        self.spawn(3)
+        self.population.clear()
+        self.spawn(1)
+
+        self.assertEqual(len(self.population), 1)
+        np.testing.assert_array_equal(self.population.id, [0])
+
+
+class TestSpatialGrid(unittest.TestCase):
+    """测试空间网格查询与暴力距离计算一致"""
+
+    def setUp(self):
+        """设置测试环境"""
+        rng = np.random.default_rng(0)
+        self.positions = (rng.random((300, 2)) * [200, 150]).astype(np.float32)
+        # 加入位于边界上的点
+        self.positions[:4] = [[0, 0], [200, 150], [200, 0], [0, 150]]
+        self.alive = rng.random(300) < 0.7
+        self.grid = SpatialGrid(self.positions, 7.0, 200, 150, self.alive)
+        self.queries = np.vstack([rng.random((50, 2)) * [200, 150], [[0, 0], [200, 150]]])
+
+    def brute_force(self, x, y, radius):
+        """半径内的存活点（暴力计算）"""
+        distances_sq = (self.positions[:, 0] - x)**2 + (self.positions[:, 1] - y)**2
+        return np.flatnonzero(self.alive & (distances_sq <= radius * radius))
+
+    def test_query_radius(self):
+        """测试query_radius的候选包含半径内所有存活点"""
+        for radius in (3.0, 10.0, 25.0):
+            for x, y in self.queries:
+                candidates = self.grid.query_radius(x, y, radius)
+                self.assertTrue(np.all(np.diff(candidates) > 0))
+                self.assertTrue(self.alive[candidates].all())
+                self.assertTrue(np.isin(self.brute_force(x, y, radius), candidates).all())
+
+    def test_count_within_radius(self):
+        """测试批量计数与暴力计算一致"""
+        xs, ys = self.queries[:, 0], self.queries[:, 1]
+        for radius in (3.0, 10.0, 25.0):
+            expected = [len(self.brute_force(x, y, radius)) for x, y in self.queries]
+            np.testing.assert_array_equal(self.grid.count_within_radius(xs, ys, radius), expected)
+
+    def test_search_cell_size(self):
+        """测试网格大小至少为最小值"""
+        self.assertGreaterEqual(SpatialGrid.search_cell_size(0, 200, 150), 1.0)
+        self.assertGreaterEqual(SpatialGrid.search_cell_size(10**6, 200, 150), 1.0)
+
+
+class TestGrassDensity(unittest.TestCase):
+    """测试草密度计算"""
+
+    def test_population_density_skips_dead_rows(self):
+        """测试死亡的草不计入密度，也不计算自身的密度"""
+        # 草足够稀疏，使密度低于上限1.0
+        config = EcosystemConfig(world_width=200, world_height=200, initial_grass=100,
+                                 initial_cows=0, initial_tigers=0, seed=0)
+        ecosystem = SimulationEngine(config).ecosystem
+        grass = ecosystem.species_registry.get_template('grass')
+        population = ecosystem.species_registry.get_population('grass')
+        population.alive[::2] = False
+        alive = population.alive
+
+        # 暴力计算：每棵存活草半径内的其他存活草
+        positions = population.pos[alive]
+        distances_sq = ((positions[:, None, 0] - positions[None, :, 0])**2 +
+                        (positions[:, None, 1] - positions[None, :, 1])**2)
+        counts = np.count_nonzero(distances_sq <= grass.competition_radius**2, axis=1) - 1
+        expected = np.minimum(1.0, counts / grass.max_possible_grass)
+        self.assertTrue(np.all(expected < 1.0))
+
+        for jit_enabled in (False, True) if _kernels.NUMBA_AVAILABLE else (False,):
+            with patch.object(_kernels, 'JIT_ENABLED', jit_enabled):
+                density = grass.calculate_population_density(population, ecosystem.get_ecosystem_state())
+            np.testing.assert_allclose(density[alive], expected)
+            np.testing.assert_array_equal(density[~alive], 0.0)
+
+    def test_population_density_value(self):
+        """测试密度按竞争圆内可容纳的草数量（pi*r^2/400）归一化"""
+        population = Population()
+        population.spawn([50, 60, 50, 150], [50, 50, 70, 150], energy=10, max_energy=40)
+        ecosystem_state = EcosystemStateData(world_width=200, world_height=200, time_step=0,
+                                             populations={'grass': population})
+        grass = Grass(Position(0, 0))
+
+        for jit_enabled in (False, True) if _kernels.NUMBA_AVAILABLE else (False,):
+            with patch.object(_kernels, 'JIT_ENABLED', jit_enabled):
+                density = grass.calculate_population_density(population, ecosystem_state)
+            # 前三棵草的半径30内各有另外两棵草：2 / (pi * 30^2 / 400) = 8 / (9 * pi)
+            np.testing.assert_allclose(density, [8 / (9 * np.pi)] * 3 + [0.0])
+
+
+@unittest.skipUnless(_kernels.NUMBA_AVAILABLE, "Numba is not installed")
+class TestKernels(unittest.TestCase):
+    """测试编译内核与NumPy实现结果一致"""
+
+    def run_steps(self, jit_enabled, steps=150, seed=0):
+        """以固定随机种子运行模拟并返回各种群的数组"""
+        config = EcosystemConfig(world_width=300, world_height=200, initial_grass=120,
+                                 initial_cows=15, initial_tigers=3, seed=seed)
+        with patch.object(_kernels, 'JIT_ENABLED', jit_enabled):
+            engine = SimulationEngine(config)
+            for _ in range(steps):
+                engine.step()
+        populations = engine.ecosystem.species_registry.get_all_populations()
+        return {name: (population.id.copy(), population.pos.copy(), population.energy.copy(),
+                       population.alive.copy())
+                for name, population in populations.items()}
+
+    def test_steps_match_numpy(self):
+        """测试相同种子下编译内核与NumPy的模拟结果相同"""
+        for seed in (0, 1):
+            compiled = self.run_steps(True, seed=seed)
+            reference = self.run_steps(False, seed=seed)
+            for name, arrays in reference.items():
+                for compiled_array, reference_array in zip(compiled[name], arrays):
+                    np.testing.assert_array_equal(compiled_array, reference_array, err_msg=name)
+
+    def test_grass_density_matches_grid_count(self):
+        """测试grass_density与网格批量计数一致"""
+        rng = np.random.default_rng(1)
+        positions = (rng.random((400, 2)) * [300, 200]).astype(np.float32)
+        alive = rng.random(400) < 0.8
+        radius = 30.0
+        max_possible_grass = np.pi * radius**2 / 400
+        grid = SpatialGrid(positions, SpatialGrid.search_cell_size(int(alive.sum()), 300, 200), 300, 200, alive)
+
+        density = _kernels.grass_density(positions[:, 0], positions[:, 1], alive, radius, max_possible_grass,
+                                         grid.cell_start, grid.cell_idx, grid.columns, grid.rows, grid.cell_size)
+
+        rows = np.flatnonzero(alive)
+        counts = grid.count_within_radius(positions[rows, 0], positions[rows, 1], radius) - 1
+        np.testing.assert_allclose(density[rows], np.minimum(1.0, counts / max_possible_grass))
+        np.testing.assert_array_equal(density[~alive], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
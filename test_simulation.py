@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+模拟引擎测试文件
+Tests for the simulation engine
+"""
+
+import sys
+import os
+import threading
+import unittest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.engine.simulation import SimulationEngine
+from backend.models.ecosystem import EcosystemConfig
+
+
+def simulation_loop_threads():
+    """存活的模拟循环线程"""
+    return [thread for thread in threading.enumerate()
+            if thread.is_alive() and thread.name == SimulationEngine.THREAD_NAME]
+
+
+class TestSimulationEngine(unittest.TestCase):
+    """测试模拟引擎的线程控制"""
+
+    # 等待线程或回调的最长时间（秒）
+    TIMEOUT = 5.0
+
+    def setUp(self):
+        """设置测试环境"""
+        self.config = EcosystemConfig(
+            world_width=100,
+            world_height=100,
+            initial_grass=20,
+            initial_cows=5,
+            initial_tigers=1,
+            seed=0
+        )
+        self.engine = SimulationEngine(self.config)
+        self.engine.set_speed(5.0)
+
+    def tearDown(self):
+        """停止模拟"""
+        self.engine.stop()
+
+    def test_reset_from_callback(self):
+        """测试在回调中重置后旧循环退出，只剩一个模拟循环"""
+        old_threads = []
+        new_loop_ran = threading.Event()
+
+        def reset_once(data):
+            if not old_threads:
+                old_threads.append(threading.current_thread())
+                self.engine.reset()
+            elif threading.current_thread() is not old_threads[0]:
+                new_loop_ran.set()
+
+        self.engine.set_update_callback(reset_once)
+        self.engine.start()
+
+        # 等待新循环执行回调，再等待旧循环退出
+        self.assertTrue(new_loop_ran.wait(self.TIMEOUT))
+        old_thread = old_threads[0]
+        old_thread.join(self.TIMEOUT)
+
+        self.assertFalse(old_thread.is_alive())
+        self.assertTrue(self.engine.is_running)
+        self.assertIsNot(self.engine.simulation_thread, old_thread)
+        self.assertEqual(simulation_loop_threads(), [self.engine.simulation_thread])
+
+        self.engine.stop()
+        self.assertFalse(old_thread.is_alive())
+        self.assertEqual(simulation_loop_threads(), [])
+
+    def test_stop_from_callback(self):
+        """测试在回调中停止后模拟循环退出"""
+        self.engine.set_update_callback(lambda data: self.engine.stop())
+        self.engine.start()
+        thread = self.engine.simulation_thread
+
+        thread.join(self.TIMEOUT)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(self.engine.is_running)
+        self.assertEqual(simulation_loop_threads(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()